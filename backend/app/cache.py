@@ -0,0 +1,91 @@
+"""Bounded in-process cache for the product and category catalog.
+
+Entries are pydantic response models (never ORM instances, which are bound to
+the session that loaded them). Writes in ``crud`` invalidate affected entries
+after commit; the TTL bounds staleness across uvicorn workers, whose caches
+are independent.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+
+CATALOG_CACHE_ENABLED = os.getenv("CATALOG_CACHE_ENABLED", "true").lower() == "true"
+CATALOG_CACHE_MAXSIZE = int(os.getenv("CATALOG_CACHE_MAXSIZE", "1024"))
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "60"))
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and hit/miss counters."""
+
+    def __init__(self, maxsize: int, ttl: float, enabled: bool = True):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+            }
+
+
+catalog_cache = TTLCache(CATALOG_CACHE_MAXSIZE, CATALOG_CACHE_TTL, enabled=CATALOG_CACHE_ENABLED)
+
+
+def invalidate_products(*product_ids: int):
+    """Drop every cached product page and the given products (e.g. after a stock change)."""
+    catalog_cache.invalidate_where(lambda key: key[0] == "products")
+    catalog_cache.invalidate(*(("product", product_id) for product_id in product_ids))
+
+
+def invalidate_categories():
+    """Drop cached categories and every cached product, since products embed their category."""
+    catalog_cache.invalidate_where(lambda key: key[0] in ("categories", "products", "product"))
@@ -0,0 +1,187 @@
+"""Negotiated response compression.
+
+``CompressionMiddleware`` picks an encoding from the request's
+``Accept-Encoding`` (zstd and brotli when their optional packages are
+installed, gzip always) and compresses JSON, CSV and NDJSON bodies of at least
+``COMPRESSION_MIN_SIZE`` bytes. Streamed bodies such as exports are compressed
+chunk by chunk, with a flush after each chunk so clients can decode as rows
+arrive.
+
+Validators stay valid across encodings because the ETags in ``versions`` are
+weak; 304 and other empty responses are passed through untouched.
+"""
+import os
+import zlib
+from typing import Optional, Sequence
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Smaller single-chunk bodies are sent as-is; compressing them costs more than it saves
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+# Server preference among encodings the client accepts with equal q-values
+COMPRESSION_ENCODINGS = [
+    encoding.strip() for encoding in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",") if encoding.strip()
+]
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class GzipEncoder:
+    def __init__(self, level: int = GZIP_LEVEL):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int = BROTLI_QUALITY):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int = ZSTD_LEVEL):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+ENCODERS = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+
+def available_encodings(preferred: Sequence[str] = COMPRESSION_ENCODINGS) -> list:
+    """``preferred`` restricted to the encoders installed in this environment."""
+    return [encoding for encoding in preferred if encoding in ENCODERS]
+
+
+def negotiate(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """The accepted encoding with the highest q-value, ties broken by the order of ``encodings``."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible responses with the negotiated encoding."""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 encodings: Sequence[str] = COMPRESSION_ENCODINGS):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(encodings)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not self._should_compress(headers, body, more_body):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = ENCODERS[encoding]()
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    body = encoder.compress(body) + encoder.flush()
+                else:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            body = encoder.compress(body) + (encoder.flush() if more_body else encoder.finish())
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if "content-encoding" in headers:
+            return False
+        if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            return False
+        # A streamed body's total size is unknown up front, so it is always compressed
+        return more_body or len(body) >= self.minimum_size
@@ -1,136 +1,604 @@
+import base64
+import json
 import logging
-from datetime import date, datetime
+from types import SimpleNamespace
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc
-from . import models, schemas
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, case, func, desc, insert, select, true, update
+from pydantic import ValidationError
+from . import importers, models, rollups, schemas, versions
+from .cache import catalog_cache, invalidate_categories, invalidate_products
 
 logger = logging.getLogger(__name__)
 
-
-def get_products(db: Session, skip: int = 0, limit: int = 100, active_only: bool = True):
-    query = db.query(models.Product)
-    if active_only:
-        query = query.filter(models.Product.is_active == True)
-    return query.offset(skip).limit(limit).all()
+# Loader strategies matching the nested response schemas, so serializing a
+# list never falls back to per-row lazy loads.
+PRODUCT_LOAD_OPTIONS = (joinedload(models.Product.category),)
+EXPENSE_LOAD_OPTIONS = (joinedload(models.Expense.category),)
+SALE_LOAD_OPTIONS = (
+    selectinload(models.Sale.sale_items)
+    .joinedload(models.SaleItem.product)
+    .joinedload(models.Product.category),
+)
+
+
+def encode_cursor(row_date: date, row_id: int) -> str:
+    """Opaque keyset cursor pointing just after (row_date, row_id)."""
+    payload = json.dumps([row_date.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        row_date, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(row_date), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _apply_keyset(query, date_column, id_column, cursor: Optional[str]):
+    """Order newest first on (date, id) and continue after the cursor, if any."""
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            date_column < cursor_date,
+            and_(date_column == cursor_date, id_column < cursor_id)
+        ))
+    return query.order_by(desc(date_column), desc(id_column))
+
+
+def get_products(db: Session, skip: int = 0, limit: int = 100, active_only: bool = True,
+                 fields: Optional[tuple] = None):
+    if fields is not None:
+        # Sparse views select only their columns and are not cached
+        return get_products_rows(db, active_only, skip=skip, limit=limit, fields=fields)
+    # Each requested page is read with OFFSET/LIMIT and cached on its own
+    key = ("products", active_only, skip, limit)
+    found, page = catalog_cache.get(key)
+    if not found:
+        page = [schemas.Product.model_validate(row)
+                for row in get_products_rows(db, active_only, skip=skip, limit=limit)]
+        catalog_cache.set(key, page)
+    return page
 
 
 def get_product(db: Session, product_id: int):
-    return db.query(models.Product).filter(models.Product.id == product_id).first()
+    found, product = catalog_cache.get(("product", product_id))
+    if found:
+        return product
+    db_product = db.query(models.Product).options(*PRODUCT_LOAD_OPTIONS).filter(models.Product.id == product_id).first()
+    if not db_product:
+        return None
+    product = schemas.Product.model_validate(db_product)
+    catalog_cache.set(("product", product_id), product)
+    return product
 
 
 def create_product(db: Session, product: schemas.ProductCreate):
     db_product = models.Product(**product.dict())
     db.add(db_product)
+    versions.bump(db, "products")
     db.commit()
     db.refresh(db_product)
+    invalidate_products(db_product.id)
     return db_product
 
 
 def get_categories(db: Session, category_type: Optional[str] = None, skip: int = 0, limit: int = 100):
-    query = db.query(models.Category)
-    if category_type:
-        query = query.filter(models.Category.category_type == category_type)
-    return query.offset(skip).limit(limit).all()
+    found, categories = catalog_cache.get(("categories", category_type))
+    if not found:
+        query = db.query(models.Category)
+        if category_type:
+            query = query.filter(models.Category.category_type == category_type)
+        categories = [schemas.Category.model_validate(category) for category in query.order_by(models.Category.id)]
+        catalog_cache.set(("categories", category_type), categories)
+    return categories[skip:skip + limit]
 
 
 def create_category(db: Session, category: schemas.CategoryCreate):
     db_category = models.Category(**category.dict())
     db.add(db_category)
+    versions.bump(db, "categories")
     db.commit()
     db.refresh(db_category)
+    invalidate_categories()
     return db_category
 
 
 def get_expenses(db: Session, skip: int = 0, limit: int = 100,
-                 start_date: Optional[date] = None, end_date: Optional[date] = None):
-    query = db.query(models.Expense)
+                 start_date: Optional[date] = None, end_date: Optional[date] = None,
+                 cursor: Optional[str] = None):
+    query = db.query(models.Expense).options(*EXPENSE_LOAD_OPTIONS)
     if start_date:
         query = query.filter(models.Expense.expense_date >= start_date)
     if end_date:
         query = query.filter(models.Expense.expense_date <= end_date)
-    return query.order_by(desc(models.Expense.expense_date)).offset(skip).limit(limit).all()
+    query = _apply_keyset(query, models.Expense.expense_date, models.Expense.id, cursor)
+    if not cursor:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 
 def create_expense(db: Session, expense: schemas.ExpenseCreate):
     db_expense = models.Expense(**expense.dict())
     db.add(db_expense)
+    rollups.record_expense(db, db_expense)
+    versions.bump(db, "expenses")
     db.commit()
     db.refresh(db_expense)
     return db_expense
 
 
 def get_sales(db: Session, skip: int = 0, limit: int = 100,
-              start_date: Optional[date] = None, end_date: Optional[date] = None):
-    query = db.query(models.Sale)
+              start_date: Optional[date] = None, end_date: Optional[date] = None,
+              cursor: Optional[str] = None):
+    query = db.query(models.Sale).options(*SALE_LOAD_OPTIONS)
     if start_date:
         query = query.filter(models.Sale.sale_date >= start_date)
     if end_date:
         query = query.filter(models.Sale.sale_date <= end_date)
-    return query.order_by(desc(models.Sale.sale_date)).offset(skip).limit(limit).all()
+    query = _apply_keyset(query, models.Sale.sale_date, models.Sale.id, cursor)
+    if not cursor:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+# Core read path: list endpoints select the response columns directly and build
+# the nested response dicts from row mappings, skipping ORM identity-map
+# hydration. Column lists follow the response schemas' field order.
+
+def _schema_columns(schema, table, prefix: str = "", only=None):
+    """Columns of ``table`` backing the scalar fields of ``schema``, labelled ``prefix + field``."""
+    return [table.c[name].label(prefix + name) for name in schema.model_fields
+            if name in table.c and (only is None or name in only)]
+
+
+# Sparse fieldsets (``?view=summary`` / ``?fields=``) for the list endpoints.
+# The key columns are always returned so pages can still be followed by cursor.
+SALE_SUMMARY_FIELDS = ("id", "sale_date", "payment_method", "customer_name",
+                       "total_amount", "discount_amount", "tax_amount")
+EXPENSE_SUMMARY_FIELDS = ("id", "expense_date", "description", "amount", "category_id", "payment_method")
+PRODUCT_SUMMARY_FIELDS = ("id", "name", "category_id", "selling_price", "current_stock", "is_active")
+SALE_KEY_FIELDS = ("id", "sale_date")
+EXPENSE_KEY_FIELDS = ("id", "expense_date")
+PRODUCT_KEY_FIELDS = ("id",)
+
+
+def resolve_fields(schema, fields: Optional[str], view: str, summary_fields, key_fields) -> Optional[tuple]:
+    """Top-level fields to return, in schema order; ``None`` means the full representation."""
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(requested - set(schema.model_fields))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)} (available: {', '.join(schema.model_fields)})")
+        requested |= set(key_fields)
+        return tuple(name for name in schema.model_fields if name in requested)
+    if view == "summary":
+        return summary_fields
+    return None
+
+
+def _nested(row, schema, table, prefix: str) -> Optional[dict]:
+    if row[prefix + "id"] is None:
+        return None
+    return {name: row[prefix + name] for name in schema.model_fields if name in table.c}
+
+
+def _product_row(row, prefix: str = "product__") -> Optional[dict]:
+    product = _nested(row, schemas.Product, models.Product.__table__, prefix)
+    if product is not None:
+        product["category"] = _nested(row, schemas.Category, models.Category.__table__, prefix + "category__")
+    return product
+
+
+def _product_columns(prefix: str = "product__"):
+    return (_schema_columns(schemas.Product, models.Product.__table__, prefix)
+            + _schema_columns(schemas.Category, models.Category.__table__, prefix + "category__"))
+
+
+def get_products_rows(db: Session, active_only: bool = True, skip: int = 0,
+                      limit: Optional[int] = None, fields: Optional[tuple] = None) -> List[dict]:
+    """Products page as response-shaped dicts limited to ``fields`` if given."""
+    products, categories = models.Product.__table__, models.Category.__table__
+    if fields is None:
+        stmt = select(*_product_columns()).select_from(
+            products.outerjoin(categories, categories.c.id == products.c.category_id)
+        )
+    elif "category" in fields:
+        stmt = select(*_schema_columns(schemas.Product, products, only=fields),
+                      *_schema_columns(schemas.Category, categories, "category__")).select_from(
+            products.outerjoin(categories, categories.c.id == products.c.category_id)
+        )
+    else:
+        stmt = select(*_schema_columns(schemas.Product, products, only=fields))
+    stmt = stmt.order_by(products.c.id).offset(skip).limit(limit)
+    if active_only:
+        stmt = stmt.where(products.c.is_active == True)
+    result = db.execute(stmt).mappings()
+    if fields is None:
+        return [_product_row(row) for row in result]
+
+    names = [name for name in fields if name in products.c]
+    rows = []
+    for row in result:
+        product = {name: row[name] for name in names}
+        if "category" in fields:
+            product["category"] = _nested(row, schemas.Category, categories, "category__")
+        rows.append(product)
+    return rows
+
+
+def get_expenses_rows(db: Session, skip: int = 0, limit: int = 100,
+                      start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      cursor: Optional[str] = None, fields: Optional[tuple] = None) -> List[dict]:
+    """Same page as ``get_expenses``, as response-shaped dicts limited to ``fields`` if given."""
+    expenses, categories = models.Expense.__table__, models.Category.__table__
+    with_category = fields is None or "category" in fields
+    columns = _schema_columns(schemas.Expense, expenses, only=fields)
+    if with_category:
+        stmt = select(*columns, *_schema_columns(schemas.Category, categories, "category__")).select_from(
+            expenses.outerjoin(categories, categories.c.id == expenses.c.category_id)
+        )
+    else:
+        stmt = select(*columns)
+    if start_date:
+        stmt = stmt.where(expenses.c.expense_date >= start_date)
+    if end_date:
+        stmt = stmt.where(expenses.c.expense_date <= end_date)
+    stmt = _apply_keyset(stmt, expenses.c.expense_date, expenses.c.id, cursor)
+    if not cursor:
+        stmt = stmt.offset(skip)
+
+    names = [column.name for column in columns]
+    rows = []
+    for row in db.execute(stmt.limit(limit)).mappings():
+        expense = {name: row[name] for name in names}
+        if with_category:
+            expense["category"] = _nested(row, schemas.Category, categories, "category__")
+        rows.append(expense)
+    return rows
+
+
+def get_sales_rows(db: Session, skip: int = 0, limit: int = 100,
+                   start_date: Optional[date] = None, end_date: Optional[date] = None,
+                   cursor: Optional[str] = None, fields: Optional[tuple] = None) -> List[dict]:
+    """Same page as ``get_sales``, as response-shaped dicts limited to ``fields`` if given.
+
+    One query for the sales and, only when ``sale_items`` is requested, one for their items.
+    """
+    sales, sale_items = models.Sale.__table__, models.SaleItem.__table__
+    products, categories = models.Product.__table__, models.Category.__table__
+    stmt = select(*_schema_columns(schemas.Sale, sales, only=fields))
+    if start_date:
+        stmt = stmt.where(sales.c.sale_date >= start_date)
+    if end_date:
+        stmt = stmt.where(sales.c.sale_date <= end_date)
+    stmt = _apply_keyset(stmt, sales.c.sale_date, sales.c.id, cursor)
+    if not cursor:
+        stmt = stmt.offset(skip)
+
+    rows = [dict(row) for row in db.execute(stmt.limit(limit)).mappings()]
+    if fields is not None and "sale_items" not in fields:
+        return rows
+    by_id = {}
+    for row in rows:
+        row["sale_items"] = []
+        by_id[row["id"]] = row
+    if not rows:
+        return rows
+
+    item_stmt = select(
+        *_schema_columns(schemas.SaleItem, sale_items),
+        *_product_columns()
+    ).select_from(
+        sale_items.outerjoin(products, products.c.id == sale_items.c.product_id)
+        .outerjoin(categories, categories.c.id == products.c.category_id)
+    ).where(sale_items.c.sale_id.in_(list(by_id))).order_by(sale_items.c.id)
+    for row in db.execute(item_stmt).mappings():
+        item = {name: row[name] for name in schemas.SaleItem.model_fields if name in sale_items.c}
+        item["product"] = _product_row(row)
+        by_id[row["sale_id"]]["sale_items"].append(item)
+    return rows
+
+
+class SaleValidationError(Exception):
+    """A sale references a missing or inactive product, or more stock than is available."""
+
+
+def _requested_quantities(items) -> dict:
+    requested = {}
+    for item in items:
+        requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+    return requested
+
+
+def _lock_products(db: Session, product_ids) -> dict:
+    """Fetch the given products in one statement, row-locked until commit (SELECT ... FOR UPDATE)."""
+    if not product_ids:
+        return {}
+    query = db.query(models.Product).filter(models.Product.id.in_(product_ids)).with_for_update()
+    return {product.id: product for product in query}
+
+
+def _stock_error(product: Optional[models.Product], product_id: int, quantity: int, available: int) -> Optional[str]:
+    if not product:
+        return f"Product with ID {product_id} not found"
+    if not product.is_active:
+        return f"Product {product.name} is not active"
+    if available < quantity:
+        return f"Insufficient stock for {product.name}"
+    return None
+
+
+def _decrement_stock(db: Session, quantities: dict):
+    """Take ``quantities`` out of stock in one conditional UPDATE.
+
+    The ``current_stock >= quantity`` guard makes the decrement itself refuse to
+    oversell, even on backends where FOR UPDATE is a no-op (SQLite).
+    """
+    quantities = {product_id: quantity for product_id, quantity in quantities.items() if quantity}
+    if not quantities:
+        return
+    products_table = models.Product.__table__
+    quantity_for = case(
+        {product_id: quantity for product_id, quantity in quantities.items()},
+        value=products_table.c.id
+    )
+    result = db.execute(
+        update(products_table)
+        .where(products_table.c.id.in_(list(quantities)), products_table.c.current_stock >= quantity_for)
+        .values(current_stock=products_table.c.current_stock - quantity_for)
+    )
+    if result.rowcount != len(quantities):
+        raise SaleValidationError("Insufficient stock to complete the sale")
 
 
 def create_sale(db: Session, sale: schemas.SaleCreate):
-    total_amount = sum(item.quantity * item.unit_price for item in sale.items) - sale.discount_amount + sale.tax_amount
-
-    sale_data = sale.dict(exclude={'items'})
-    sale_data['total_amount'] = total_amount
-    db_sale = models.Sale(**sale_data)
-
-    db.add(db_sale)
-    db.flush()
-
-    for item in sale.items:
-        item_data = item.dict()
-        item_data['sale_id'] = db_sale.id
-        item_data['total_price'] = item.quantity * item.unit_price
-
-        db_sale_item = models.SaleItem(**item_data)
-        db.add(db_sale_item)
+    requested = _requested_quantities(sale.items)
+    try:
+        products = _lock_products(db, requested)
+        for product_id, quantity in requested.items():
+            product = products.get(product_id)
+            error = _stock_error(product, product_id, quantity, product.current_stock if product else 0)
+            if error:
+                raise SaleValidationError(error)
+
+        total_amount = sum(item.quantity * item.unit_price for item in sale.items) - sale.discount_amount + sale.tax_amount
+
+        sale_data = sale.dict(exclude={'items'})
+        sale_data['total_amount'] = total_amount
+        db_sale = models.Sale(**sale_data)
+
+        db.add(db_sale)
+        db.flush()
+
+        db.add_all([
+            models.SaleItem(**item.dict(), sale_id=db_sale.id, total_price=item.quantity * item.unit_price)
+            for item in sale.items
+        ])
+        _decrement_stock(db, requested)
+
+        rollups.record_sale(db, db_sale, sale.items)
+        versions.bump(db, "sales", "products")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    invalidate_products(*requested)
+    return db.query(models.Sale).options(*SALE_LOAD_OPTIONS).filter(models.Sale.id == db_sale.id).one()
+
+
+def _insert_returning_ids(db: Session, model, rows: List[dict], chunk_size: int = 1000) -> List[int]:
+    """Multi-row insert of ``rows`` returning the generated ids in input order."""
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        return list(db.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows).scalars())
+
+    # MySQL has no RETURNING: a single multi-row INSERT is assigned a consecutive
+    # auto-increment range starting at LAST_INSERT_ID() (auto_increment_increment=1).
+    ids = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        result = db.execute(insert(model).values(chunk))
+        ids.extend(range(result.lastrowid, result.lastrowid + len(chunk)))
+    return ids
+
+
+def create_sales_bulk(db: Session, sales: List[schemas.SaleCreate]):
+    """Validate and insert a batch of sales in one transaction.
+
+    Stock is checked against a single fetch of every referenced product and
+    consumed in upload order, so a later sale fails if earlier ones in the
+    same batch used up the stock. Invalid sales are reported, not inserted.
+    """
+    try:
+        products = _lock_products(db, {item.product_id for sale in sales for item in sale.items})
+        remaining_stock = {product_id: product.current_stock for product_id, product in products.items()}
+
+        results, accepted = [], []
+        for index, sale in enumerate(sales):
+            error = None
+            requested = _requested_quantities(sale.items)
+            for product_id, quantity in requested.items():
+                error = _stock_error(products.get(product_id), product_id, quantity, remaining_stock.get(product_id, 0))
+                if error:
+                    break
+
+            if error:
+                results.append({"index": index, "success": False, "error": error})
+                continue
+
+            for product_id, quantity in requested.items():
+                remaining_stock[product_id] -= quantity
+            results.append({"index": index, "success": True})
+            accepted.append((index, sale))
+
+        if accepted:
+            sale_rows = []
+            for _, sale in accepted:
+                row = sale.dict(exclude={'items'})
+                row['total_amount'] = (sum(item.quantity * item.unit_price for item in sale.items)
+                                       - sale.discount_amount + sale.tax_amount)
+                sale_rows.append(row)
+            sale_ids = _insert_returning_ids(db, models.Sale, sale_rows)
+
+            item_rows = [
+                dict(item.dict(), sale_id=sale_id, total_price=item.quantity * item.unit_price)
+                for sale_id, (_, sale) in zip(sale_ids, accepted)
+                for item in sale.items
+            ]
+            db.execute(insert(models.SaleItem), item_rows)
+
+            _decrement_stock(db, {
+                product_id: products[product_id].current_stock - stock
+                for product_id, stock in remaining_stock.items()
+            })
+
+            rollups.record_sales(db, [
+                (SimpleNamespace(**row), sale.items) for row, (_, sale) in zip(sale_rows, accepted)
+            ])
+
+            for sale_id, (index, _) in zip(sale_ids, accepted):
+                results[index]["sale_id"] = sale_id
+
+            versions.bump(db, "sales", "products")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    invalidate_products(*products)
+    return {
+        "created": len(accepted),
+        "failed": len(sales) - len(accepted),
+        "results": results
+    }
 
-        # Update product stock
-        db_product = get_product(db, item.product_id)
-        if db_product:
-            db_product.current_stock -= item.quantity
 
-    db.commit()
-    db.refresh(db_sale)
-    return db_sale
+MAX_REPORTED_IMPORT_ERRORS = 100
+
+
+def _import_records(db: Session, records, schema, model, dedup_field: str, on_chunk=None,
+                    chunk_size: int = 500):
+    """Validate, de-duplicate and insert streamed records in chunked transactions.
+
+    ``records`` yields ``(line_number, dict)`` pairs. Records whose ``dedup_field``
+    was already seen in the file or already exists in the table are skipped;
+    records without a value for it are always inserted.
+    """
+    dedup_column = getattr(model, dedup_field)
+    seen = set()
+    summary = {"processed": 0, "inserted": 0, "duplicates": 0, "failed": 0, "errors": []}
+
+    def report(line_number, error):
+        summary["failed"] += 1
+        if len(summary["errors"]) < MAX_REPORTED_IMPORT_ERRORS:
+            summary["errors"].append({"line": line_number, "error": error})
+
+    def flush(chunk):
+        keys = {getattr(item, dedup_field) for item in chunk if getattr(item, dedup_field)}
+        existing = set()
+        if keys:
+            existing = {row[0] for row in db.query(dedup_column).filter(dedup_column.in_(keys))}
+        rows = [item for item in chunk if not getattr(item, dedup_field) or getattr(item, dedup_field) not in existing]
+        summary["duplicates"] += len(chunk) - len(rows)
+        if rows:
+            db.execute(insert(model), [item.dict() for item in rows])
+            if on_chunk:
+                on_chunk(db, rows)
+            versions.bump(db, model.__tablename__)
+        db.commit()
+        summary["inserted"] += len(rows)
+
+    chunk = []
+    for line_number, record in records:
+        summary["processed"] += 1
+        if record is None:
+            report(line_number, "Malformed record")
+            continue
+        try:
+            item = schema(**record)
+        except ValidationError as e:
+            report(line_number, importers.format_validation_error(e))
+            continue
+
+        key = getattr(item, dedup_field)
+        if key:
+            if key in seen:
+                summary["duplicates"] += 1
+                continue
+            seen.add(key)
+
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+
+    logger.info(f"Imported {summary['inserted']} {model.__tablename__} "
+                f"({summary['duplicates']} duplicates, {summary['failed']} failed)")
+    return summary
+
+
+def import_products(db: Session, records, chunk_size: int = 500):
+    try:
+        return _import_records(db, records, schemas.ProductCreate, models.Product, "name", chunk_size=chunk_size)
+    finally:
+        invalidate_products()
+
+
+def import_expenses(db: Session, records, chunk_size: int = 500):
+    return _import_records(db, records, schemas.ExpenseCreate, models.Expense, "receipt_number",
+                           on_chunk=rollups.record_expenses, chunk_size=chunk_size)
 
 
 def get_dashboard_summary(db: Session):
     today = date.today()
-
-    # Today's metrics
-    today_sales = db.query(func.coalesce(func.sum(models.Sale.total_amount), 0)).filter(
-        models.Sale.sale_date == today
-    ).scalar()
-
-    today_expenses = db.query(func.coalesce(func.sum(models.Expense.amount), 0)).filter(
-        models.Expense.expense_date == today
-    ).scalar()
-
-    # This month metrics
     month_start = today.replace(day=1)
-    month_sales = db.query(func.coalesce(func.sum(models.Sale.total_amount), 0)).filter(
-        and_(models.Sale.sale_date >= month_start, models.Sale.sale_date <= today)
-    ).scalar()
 
-    month_expenses = db.query(func.coalesce(func.sum(models.Expense.amount), 0)).filter(
-        and_(models.Expense.expense_date >= month_start, models.Expense.expense_date <= today)
-    ).scalar()
-
-    # Low stock products
-    low_stock_count = db.query(func.count(models.Product.id)).filter(
+    # Month-window totals come from the daily rollups, with today's figures picked
+    # out by conditional aggregation; together with the inventory alert count this
+    # is a single round-trip over a few dozen rollup rows.
+    sales_totals = select(
+        func.coalesce(func.sum(case(
+            (models.SalesDailyRollup.sale_date == today, models.SalesDailyRollup.total_amount), else_=0
+        )), 0).label('today_sales'),
+        func.coalesce(func.sum(models.SalesDailyRollup.total_amount), 0).label('month_sales'),
+        func.coalesce(func.sum(case(
+            (models.SalesDailyRollup.sale_date == today, models.SalesDailyRollup.sale_count), else_=0
+        )), 0).label('recent_sales_count')
+    ).where(
+        and_(models.SalesDailyRollup.sale_date >= month_start, models.SalesDailyRollup.sale_date <= today)
+    ).subquery()
+
+    expense_totals = select(
+        func.coalesce(func.sum(case(
+            (models.ExpenseDailyRollup.expense_date == today, models.ExpenseDailyRollup.total_amount), else_=0
+        )), 0).label('today_expenses'),
+        func.coalesce(func.sum(models.ExpenseDailyRollup.total_amount), 0).label('month_expenses')
+    ).where(
+        and_(models.ExpenseDailyRollup.expense_date >= month_start, models.ExpenseDailyRollup.expense_date <= today)
+    ).subquery()
+
+    low_stock = select(
+        func.count(models.Product.id).label('low_stock_count')
+    ).where(
         models.Product.current_stock <= models.Product.minimum_stock_level,
         models.Product.is_active == True
-    ).scalar()
+    ).subquery()
+
+    totals = db.execute(
+        select(sales_totals, expense_totals, low_stock).select_from(
+            sales_totals.join(expense_totals, true()).join(low_stock, true())
+        )
+    ).one()
 
-    # Recent sales count
-    recent_sales_count = db.query(func.count(models.Sale.id)).filter(
-        models.Sale.sale_date == today
-    ).scalar()
+    today_sales, month_sales = totals.today_sales, totals.month_sales
+    today_expenses, month_expenses = totals.today_expenses, totals.month_expenses
+    low_stock_count, recent_sales_count = totals.low_stock_count, int(totals.recent_sales_count)
 
     return {
         "metrics": {
@@ -154,29 +622,173 @@ def get_dashboard_summary(db: Session):
     }
 
 
-def get_product_profit_analysis(db: Session):
-    results = db.query(
+PROFIT_SORT_FIELDS = ("profit", "revenue", "quantity", "margin", "cost", "name")
+
+
+def get_product_profit_analysis(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                                category_id: Optional[int] = None, sort_by: str = "profit", order: str = "desc",
+                                skip: int = 0, limit: int = 100):
+    """Per-product sales, cost and profit, sorted and paginated.
+
+    Without a date range this reads the lifetime ``product_sales_totals`` (one
+    row per product); with one it sums ``product_sales_daily_rollup`` over the
+    range. Products without sales in scope are included with zero totals.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise ValueError("start must not be after end")
+    if sort_by not in PROFIT_SORT_FIELDS:
+        raise ValueError(f"sort_by must be one of: {', '.join(PROFIT_SORT_FIELDS)}")
+
+    if start_date is None and end_date is None:
+        totals = select(
+            models.ProductSalesTotal.product_id,
+            models.ProductSalesTotal.quantity_sold,
+            models.ProductSalesTotal.total_revenue,
+            models.ProductSalesTotal.total_cost
+        ).subquery()
+    else:
+        rollup = models.ProductSalesDailyRollup
+        conditions = []
+        if start_date:
+            conditions.append(rollup.sale_date >= start_date)
+        if end_date:
+            conditions.append(rollup.sale_date <= end_date)
+        totals = select(
+            rollup.product_id,
+            func.sum(rollup.quantity_sold).label('quantity_sold'),
+            func.sum(rollup.total_revenue).label('total_revenue'),
+            func.sum(rollup.total_cost).label('total_cost')
+        ).where(*conditions).group_by(rollup.product_id).subquery()
+
+    quantity = func.coalesce(totals.c.quantity_sold, 0)
+    revenue = func.coalesce(totals.c.total_revenue, 0)
+    cost = func.coalesce(totals.c.total_cost, 0)
+    profit = revenue - cost
+    margin = case((revenue > 0, profit * 100 / revenue), else_=0)
+    sort_columns = {
+        "profit": profit, "revenue": revenue, "quantity": quantity,
+        "margin": margin, "cost": cost, "name": models.Product.name,
+    }
+    sort_column = sort_columns[sort_by]
+
+    stmt = select(
         models.Product.id,
         models.Product.name,
         models.Category.name.label('category_name'),
-        func.coalesce(func.sum(models.SaleItem.quantity), 0).label('total_quantity_sold'),
-        func.coalesce(func.sum(models.SaleItem.total_price), 0).label('total_revenue'),
-        func.coalesce(func.sum(models.SaleItem.cost_price * models.SaleItem.quantity), 0).label('total_cost')
-    ).outerjoin(models.Category).outerjoin(models.SaleItem).group_by(
-        models.Product.id, models.Product.name, models.Category.name
-    ).all()
-
-    return [
-        {
+        quantity.label('total_quantity_sold'),
+        revenue.label('total_revenue'),
+        cost.label('total_cost')
+    ).outerjoin(models.Category, models.Category.id == models.Product.category_id).outerjoin(
+        totals, totals.c.product_id == models.Product.id
+    )
+    count_stmt = select(func.count(models.Product.id))
+    if category_id is not None:
+        stmt = stmt.where(models.Product.category_id == category_id)
+        count_stmt = count_stmt.where(models.Product.category_id == category_id)
+
+    stmt = stmt.order_by(sort_column.asc() if order == "asc" else sort_column.desc(), models.Product.id)
+    results = db.execute(stmt.offset(skip).limit(limit)).all()
+    total = db.execute(count_stmt).scalar()
+
+    data = []
+    for result in results:
+        total_revenue = Decimal(result.total_revenue)
+        total_cost = Decimal(result.total_cost)
+        data.append({
             "id": result.id,
             "name": result.name,
             "category_name": result.category_name or "Uncategorized",
-            "total_quantity_sold": result.total_quantity_sold,
-            "total_revenue": float(result.total_revenue),
-            "total_cost": float(result.total_cost),
-            "total_profit": float(result.total_revenue - result.total_cost),
-            "profit_margin_percentage": float((
-                                                          result.total_revenue - result.total_cost) / result.total_revenue * 100) if result.total_revenue > 0 else 0
-        }
-        for result in results
-    ]
\ No newline at end of file
+            "total_quantity_sold": int(result.total_quantity_sold),
+            "total_revenue": float(total_revenue),
+            "total_cost": float(total_cost),
+            "total_profit": float(total_revenue - total_cost),
+            "profit_margin_percentage": float(
+                (total_revenue - total_cost) / total_revenue * 100) if total_revenue > 0 else 0
+        })
+    return {"data": data, "total": total}
+
+
+def _period_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(period: date, granularity: str) -> date:
+    if granularity == "week":
+        return period + timedelta(weeks=1)
+    if granularity == "month":
+        return (period.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return period + timedelta(days=1)
+
+
+# Most periods one trends response may cover; wider ranges are rejected rather than gap-filled
+TREND_MAX_PERIODS = {"day": 366, "week": 260, "month": 120}
+
+
+def _period_count(start: date, end: date, granularity: str) -> int:
+    if granularity == "week":
+        return (_period_start(end, "week") - _period_start(start, "week")).days // 7 + 1
+    if granularity == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
+
+
+def get_trends(db: Session, granularity: str = "month",
+               start_date: Optional[date] = None, end_date: Optional[date] = None):
+    end_date = end_date or date.today()
+    if not start_date:
+        start_date = {
+            "day": end_date - timedelta(days=29),
+            "week": _period_start(end_date, "week") - timedelta(weeks=11),
+            "month": (_period_start(end_date, "month") - timedelta(days=150)).replace(day=1),
+        }[granularity]
+    if start_date > end_date:
+        raise ValueError("start must not be after end")
+    if _period_count(start_date, end_date, granularity) > TREND_MAX_PERIODS[granularity]:
+        raise ValueError(f"range spans more than {TREND_MAX_PERIODS[granularity]} {granularity} periods")
+
+    # One grouped query per series over the daily rollups; the (at most one row
+    # per day) results are folded into the requested periods below.
+    sales_by_day = db.query(
+        models.SalesDailyRollup.sale_date,
+        func.sum(models.SalesDailyRollup.total_amount)
+    ).filter(
+        and_(models.SalesDailyRollup.sale_date >= start_date, models.SalesDailyRollup.sale_date <= end_date)
+    ).group_by(models.SalesDailyRollup.sale_date).all()
+
+    expenses_by_day = db.query(
+        models.ExpenseDailyRollup.expense_date,
+        func.sum(models.ExpenseDailyRollup.total_amount)
+    ).filter(
+        and_(models.ExpenseDailyRollup.expense_date >= start_date, models.ExpenseDailyRollup.expense_date <= end_date)
+    ).group_by(models.ExpenseDailyRollup.expense_date).all()
+
+    # Gap-fill every period in range so the series are continuous
+    buckets = {}
+    period = _period_start(start_date, granularity)
+    while period <= end_date:
+        buckets[period] = {"sales": Decimal("0"), "expenses": Decimal("0")}
+        period = _next_period(period, granularity)
+
+    for day, amount in sales_by_day:
+        buckets[_period_start(day, granularity)]["sales"] += Decimal(str(amount or 0))
+    for day, amount in expenses_by_day:
+        buckets[_period_start(day, granularity)]["expenses"] += Decimal(str(amount or 0))
+
+    return {
+        "granularity": granularity,
+        "start": start_date.isoformat(),
+        "end": end_date.isoformat(),
+        "data": [
+            {
+                "period": period.isoformat(),
+                "sales": float(totals["sales"]),
+                "expenses": float(totals["expenses"]),
+                "profit": float(totals["sales"] - totals["expenses"])
+            }
+            for period, totals in buckets.items()
+        ]
+    }
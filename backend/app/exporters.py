@@ -0,0 +1,157 @@
+"""Streaming CSV / NDJSON exports of sales and expenses.
+
+Rows are pulled through a server-side cursor (``yield_per``) and written out
+in small buffered chunks, so memory stays constant regardless of the date
+range. Each export opens its own session because the response body is
+produced after the request's dependencies have been torn down.
+"""
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Iterator, Optional
+from sqlalchemy import and_, select, true
+from .database import SessionLocal
+from . import models
+
+EXPORT_BATCH_SIZE = 1000
+FLUSH_BYTES = 64 * 1024
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+SALE_COLUMNS = [
+    "sale_id", "sale_date", "payment_method", "customer_name", "total_amount", "discount_amount", "tax_amount",
+    "item_id", "product_id", "product_name", "quantity", "unit_price", "total_price", "cost_price",
+]
+SALE_ITEM_COLUMNS = SALE_COLUMNS[7:]
+
+EXPENSE_COLUMNS = [
+    "id", "expense_date", "description", "amount", "category_id", "category_name",
+    "payment_method", "vendor_name", "receipt_number", "notes",
+]
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _date_range(column, start_date: Optional[date], end_date: Optional[date]):
+    conditions = []
+    if start_date:
+        conditions.append(column >= start_date)
+    if end_date:
+        conditions.append(column <= end_date)
+    return and_(true(), *conditions)
+
+
+def _stream_rows(stmt) -> Iterator:
+    db = SessionLocal()
+    try:
+        for row in db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)):
+            yield row
+    finally:
+        db.close()
+
+
+def _encode_csv(columns, records: Iterator[dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow({key: _json_value(value) for key, value in record.items()})
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _encode_ndjson(records: Iterator[dict]) -> Iterator[bytes]:
+    chunk = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, default=_json_value) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(chunk).encode()
+            chunk, size = [], 0
+    yield "".join(chunk).encode()
+
+
+def stream_sales(fmt: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Iterator[bytes]:
+    """CSV has one row per sale item (sale columns repeated); NDJSON has one object per sale."""
+    stmt = select(
+        models.Sale.id.label("sale_id"),
+        models.Sale.sale_date,
+        models.Sale.payment_method,
+        models.Sale.customer_name,
+        models.Sale.total_amount,
+        models.Sale.discount_amount,
+        models.Sale.tax_amount,
+        models.SaleItem.id.label("item_id"),
+        models.SaleItem.product_id,
+        models.Product.name.label("product_name"),
+        models.SaleItem.quantity,
+        models.SaleItem.unit_price,
+        models.SaleItem.total_price,
+        models.SaleItem.cost_price
+    ).outerjoin(models.SaleItem, models.SaleItem.sale_id == models.Sale.id).outerjoin(
+        models.Product, models.Product.id == models.SaleItem.product_id
+    ).where(
+        _date_range(models.Sale.sale_date, start_date, end_date)
+    ).order_by(models.Sale.sale_date, models.Sale.id, models.SaleItem.id)
+
+    rows = (dict(row._mapping) for row in _stream_rows(stmt))
+    if fmt == "csv":
+        return _encode_csv(SALE_COLUMNS, rows)
+    return _encode_ndjson(_group_sale_items(rows))
+
+
+def _group_sale_items(rows: Iterator[dict]) -> Iterator[dict]:
+    """Fold consecutive flattened rows of the same sale into one nested record."""
+    current = None
+    for row in rows:
+        if current is None or current["sale_id"] != row["sale_id"]:
+            if current is not None:
+                yield current
+            current = {key: value for key, value in row.items() if key not in SALE_ITEM_COLUMNS}
+            current["items"] = []
+        if row["item_id"] is not None:
+            current["items"].append({key: row[key] for key in SALE_ITEM_COLUMNS})
+    if current is not None:
+        yield current
+
+
+def stream_expenses(fmt: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Iterator[bytes]:
+    stmt = select(
+        models.Expense.id,
+        models.Expense.expense_date,
+        models.Expense.description,
+        models.Expense.amount,
+        models.Expense.category_id,
+        models.Category.name.label("category_name"),
+        models.Expense.payment_method,
+        models.Expense.vendor_name,
+        models.Expense.receipt_number,
+        models.Expense.notes
+    ).outerjoin(models.Category, models.Category.id == models.Expense.category_id).where(
+        _date_range(models.Expense.expense_date, start_date, end_date)
+    ).order_by(models.Expense.expense_date, models.Expense.id)
+
+    rows = (dict(row._mapping) for row in _stream_rows(stmt))
+    if fmt == "csv":
+        return _encode_csv(EXPENSE_COLUMNS, rows)
+    return _encode_ndjson(rows)
+
+
+def export_filename(prefix: str, fmt: str, start_date: Optional[date], end_date: Optional[date]) -> str:
+    return f"{prefix}_{start_date or 'all'}_{end_date or 'all'}.{fmt}"
@@ -0,0 +1,49 @@
+"""Incremental CSV / NDJSON record readers for bulk imports.
+
+Uploaded files are read line by line from the spooled upload, so an import
+never holds the whole file in memory.
+"""
+import codecs
+import csv
+import json
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def iter_records(fileobj: BinaryIO, fmt: str) -> Iterator[Tuple[int, dict]]:
+    """Yield ``(line_number, record)`` pairs; malformed lines yield ``(line_number, None)``."""
+    text = codecs.getreader("utf-8-sig")(fileobj)
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Empty cells mean "not provided" so schema defaults apply
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            yield line_number, record if isinstance(record, dict) else None
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def format_validation_error(exc) -> str:
+    """Compact one-line summary of a pydantic ValidationError."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
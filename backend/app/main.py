@@ -1,25 +1,37 @@
 import logging
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from .database import engine, Base
+from fastapi.responses import JSONResponse, PlainTextResponse
+from .database import DEBUG, engine, Base, SessionLocal, shutdown_db_executor
+from . import rollups
+from .compression import COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, CompressionMiddleware
+from .telemetry import METRICS_ENABLED, MetricsMiddleware, pool_metrics, render_prometheus
 from .routers import analytics, expenses, products, sales
 
 # Setup logging
-Path("/app/logs").mkdir(exist_ok=True)
+LOG_DIR = Path(os.getenv("LOG_DIR", "/app/logs"))
+LOG_DIR.mkdir(parents=True, exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('/app/logs/app.log'),
+        logging.FileHandler(LOG_DIR / 'app.log'),
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Statements over SLOW_QUERY_MS go to their own file rather than app.log
+slow_query_handler = logging.FileHandler(LOG_DIR / 'slow_queries.log')
+slow_query_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+slow_query_logger = logging.getLogger("smarttrack.slow_queries")
+slow_query_logger.addHandler(slow_query_handler)
+slow_query_logger.propagate = False
+
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
@@ -38,8 +50,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-DB-Queries", "X-DB-Time-ms", "ETag", "Last-Modified"],
 )
 
+# Negotiated gzip/br/zstd compression for JSON, CSV and NDJSON bodies
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+# Per-route request metrics, scraped from /metrics; in debug mode also per-response DB headers
+if METRICS_ENABLED or DEBUG:
+    app.add_middleware(MetricsMiddleware, record_metrics=METRICS_ENABLED, query_headers=DEBUG)
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Global exception: {str(exc)}")
@@ -48,6 +69,20 @@ async def global_exception_handler(request, exc):
         content={"detail": "Internal server error occurred"}
     )
 
+@app.on_event("startup")
+async def startup_event():
+    db = SessionLocal()
+    try:
+        rollups.ensure_populated(db)
+    except Exception as e:
+        logger.warning(f"Could not verify daily rollups: {str(e)}")
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_db_executor()
+
 @app.get("/health")
 async def health_check():
     return {
@@ -57,6 +92,16 @@ async def health_check():
         "service": "SmartTrack Backend"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request, database and pool metrics in the Prometheus text format."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/pool")
+async def pool_metrics_snapshot():
+    """Connection pool occupancy, checkout wait times and checkout timeouts."""
+    return pool_metrics.snapshot()
+
 @app.get("/")
 async def root():
     return {
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text, DECIMAL, Date, DateTime, Boolean, Enum, ForeignKey
+from sqlalchemy import Integer, String, Text, DECIMAL, Date, DateTime, Boolean, Enum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -43,6 +43,9 @@ class Product(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("idx_expense_date_id", "expense_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     description: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -61,6 +64,9 @@ class Expense(Base):
 
 class Sale(Base):
     __tablename__ = "sales"
+    __table_args__ = (
+        Index("idx_sale_date_id", "sale_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     sale_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
@@ -89,4 +95,54 @@ class SaleItem(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     sale: Mapped["Sale"] = relationship("Sale", back_populates="sale_items")
-    product: Mapped["Product"] = relationship("Product", back_populates="sale_items")
\ No newline at end of file
+    product: Mapped["Product"] = relationship("Product", back_populates="sale_items")
+
+
+class SalesDailyRollup(Base):
+    __tablename__ = "sales_daily_rollup"
+
+    sale_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    payment_method: Mapped[str] = mapped_column(Enum('cash', 'card', 'bank_transfer', 'mobile_money'), primary_key=True)
+    sale_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_amount: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), nullable=False, default=0.00)
+    discount_amount: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), nullable=False, default=0.00)
+    tax_amount: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), nullable=False, default=0.00)
+
+
+class ProductSalesDailyRollup(Base):
+    __tablename__ = "product_sales_daily_rollup"
+
+    sale_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    quantity_sold: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_revenue: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), nullable=False, default=0.00)
+    total_cost: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), nullable=False, default=0.00)
+
+
+class ProductSalesTotal(Base):
+    """Lifetime sales per product, kept in step with ``product_sales_daily_rollup``."""
+    __tablename__ = "product_sales_totals"
+
+    product_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    quantity_sold: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_revenue: Mapped[Decimal] = mapped_column(DECIMAL(16, 2), nullable=False, default=0.00)
+    total_cost: Mapped[Decimal] = mapped_column(DECIMAL(16, 2), nullable=False, default=0.00)
+
+
+class ExpenseDailyRollup(Base):
+    __tablename__ = "expense_daily_rollup"
+
+    expense_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    # 0 stands for uncategorized expenses so the key stays NOT NULL
+    category_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    expense_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_amount: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), nullable=False, default=0.00)
+
+
+class TableVersion(Base):
+    """Per-table write counter backing the ETag / Last-Modified validators (see ``versions``)."""
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,118 @@
+"""Fast JSON rendering for large list and analytics responses.
+
+FastAPI's default path validates the return value against ``response_model``,
+turns it into plain Python structures and then encodes those with the stdlib
+``json`` module. For list endpoints the same work is done here in one pass:
+a cached pydantic ``TypeAdapter`` validates the ORM objects and serializes
+straight to JSON bytes in pydantic-core.
+
+Decimals are rendered as strings by default (what FastAPI returns today) or as
+floats with ``JSON_DECIMALS=float``. Floats come from a variant of the schema
+whose Decimal fields serialize as JSON numbers, so both modes are a single
+``dump_json``. Plain dicts (analytics, Core rows) are encoded with orjson when
+it is installed.
+"""
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Annotated, Any, List, Optional, Union, get_args, get_origin
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, PlainSerializer, TypeAdapter, create_model
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+# "string" keeps Decimal precision ("800.00"); "float" emits JSON numbers (800.0)
+JSON_DECIMALS = os.getenv("JSON_DECIMALS", "string").lower()
+# Set to false to send list endpoints back through FastAPI's response_model path
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "true").lower() == "true"
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema) -> TypeAdapter:
+    """Built once per schema; building an adapter is far costlier than using it."""
+    return TypeAdapter(List[schema])
+
+
+FloatDecimal = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
+
+
+def _with_float_decimals(annotation):
+    if annotation is Decimal:
+        return FloatDecimal
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return float_schema(annotation)
+    args = get_args(annotation)
+    if get_origin(annotation) is Union:
+        return Union[tuple(_with_float_decimals(arg) for arg in args)]
+    if get_origin(annotation) is list:
+        return List[_with_float_decimals(args[0])]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def float_schema(schema):
+    """Subclass of ``schema`` (and of its nested schemas) dumping Decimal fields as JSON numbers."""
+    overrides = {}
+    for name, field in schema.model_fields.items():
+        annotation = _with_float_decimals(field.annotation)
+        if annotation != field.annotation:
+            overrides[name] = (annotation, field)
+    if not overrides:
+        return schema
+    return create_model(schema.__name__, __base__=schema, **overrides)
+
+
+def _json_default(decimals: Optional[str]):
+    as_string = (decimals or JSON_DECIMALS) == "string"
+
+    def default(value):
+        if isinstance(value, Decimal):
+            return str(value) if as_string else float(value)
+        if isinstance(value, (date, datetime)):  # orjson handles these natively
+            return value.isoformat()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    return default
+
+
+def dumps(content: Any, decimals: Optional[str] = None) -> bytes:
+    """Encode plain Python content (dicts, lists, Decimals, dates) to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default(decimals))
+    return json.dumps(content, default=_json_default(decimals), separators=(",", ":")).encode()
+
+
+def render_list(schema, objects, decimals: Optional[str] = None) -> bytes:
+    """Validate ``objects`` (ORM instances or models) as ``List[schema]`` and encode them."""
+    if (decimals or JSON_DECIMALS) != "string":
+        schema = float_schema(schema)
+    adapter = list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+
+
+def list_response(schema, objects, headers: Optional[dict] = None, decimals: Optional[str] = None) -> Response:
+    """Response for a ``response_model=List[schema]`` endpoint that skips FastAPI's re-encoding.
+
+    Returning a ``Response`` bypasses the route's ``response_model`` handling, so
+    headers must be passed here rather than set on an injected ``Response``.
+    """
+    return Response(render_list(schema, objects, decimals), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def rows_response(rows, headers: Optional[dict] = None, decimals: Optional[str] = None) -> Response:
+    """Response for response-shaped dicts from the Core read path; they need no validation."""
+    return Response(dumps(rows, decimals), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+class FastJSONResponse(JSONResponse):
+    """``response_class`` for endpoints returning plain dicts (e.g. analytics)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
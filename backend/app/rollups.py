@@ -0,0 +1,246 @@
+"""Daily rollup tables for sales and expenses.
+
+The rollups are kept in step with the raw tables inside the same transaction
+as ``crud.create_sale`` / ``crud.create_expense``, so analytics can read a few
+rows per day instead of scanning the full transaction history. Lifetime
+per-product totals are maintained the same way for the profit analysis.
+
+Rebuild them from the raw tables (e.g. after bulk SQL imports) with:
+
+    python -m app.rollups rebuild [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+import argparse
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import and_, delete, func, insert, select, true, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from . import models, versions
+
+logger = logging.getLogger(__name__)
+
+
+def _upsert_increment(db: Session, model, keys: dict, increments: dict, assignments: Optional[dict] = None):
+    """Add ``increments`` to the rollup row identified by ``keys``, creating it if needed.
+
+    ``assignments`` are columns overwritten with the given values rather than added to.
+    """
+    dialect = db.get_bind().dialect.name
+    assignments = assignments or {}
+    values = {**keys, **increments, **assignments}
+
+    if dialect == "mysql":
+        stmt = mysql_insert(model).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            {**{column: getattr(model, column) + stmt.inserted[column] for column in increments},
+             **{column: stmt.inserted[column] for column in assignments}}
+        )
+        db.execute(stmt)
+    elif dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        stmt = dialect_insert(model).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={**{column: getattr(model, column) + stmt.excluded[column] for column in increments},
+                  **{column: stmt.excluded[column] for column in assignments}}
+        )
+        db.execute(stmt)
+    else:
+        key_filter = and_(*(getattr(model, column) == value for column, value in keys.items()))
+        result = db.execute(
+            update(model).where(key_filter).values(
+                {**{column: getattr(model, column) + value for column, value in increments.items()},
+                 **assignments}
+            )
+        )
+        if result.rowcount == 0:
+            db.execute(insert(model).values(**values))
+
+
+def record_sale(db: Session, db_sale: models.Sale, items):
+    """Fold a newly inserted sale and its items into the daily rollups."""
+    record_sales(db, [(db_sale, items)])
+
+
+def record_sales(db: Session, sales):
+    """Fold a batch of ``(sale, items)`` pairs into the rollups, one upsert per distinct key."""
+    per_day, per_product = {}, {}
+    for db_sale, items in sales:
+        key = (db_sale.sale_date, db_sale.payment_method)
+        count, total, discount, tax = per_day.get(key, (0, Decimal("0"), Decimal("0"), Decimal("0")))
+        per_day[key] = (
+            count + 1,
+            total + db_sale.total_amount,
+            discount + (db_sale.discount_amount or Decimal("0")),
+            tax + (db_sale.tax_amount or Decimal("0")),
+        )
+        for item in items:
+            key = (db_sale.sale_date, item.product_id)
+            quantity, revenue, cost = per_product.get(key, (0, Decimal("0"), Decimal("0")))
+            per_product[key] = (
+                quantity + item.quantity,
+                revenue + item.quantity * item.unit_price,
+                cost + item.quantity * item.cost_price,
+            )
+
+    for (sale_date, payment_method), (count, total, discount, tax) in per_day.items():
+        _upsert_increment(
+            db, models.SalesDailyRollup,
+            {"sale_date": sale_date, "payment_method": payment_method},
+            {"sale_count": count, "total_amount": total, "discount_amount": discount, "tax_amount": tax}
+        )
+    per_product_total = {}
+    for (sale_date, product_id), (quantity, revenue, cost) in per_product.items():
+        _upsert_increment(
+            db, models.ProductSalesDailyRollup,
+            {"sale_date": sale_date, "product_id": product_id},
+            {"quantity_sold": quantity, "total_revenue": revenue, "total_cost": cost}
+        )
+        total_quantity, total_revenue, total_cost = per_product_total.get(product_id, (0, Decimal("0"), Decimal("0")))
+        per_product_total[product_id] = (total_quantity + quantity, total_revenue + revenue, total_cost + cost)
+    for product_id, (quantity, revenue, cost) in per_product_total.items():
+        _upsert_increment(
+            db, models.ProductSalesTotal,
+            {"product_id": product_id},
+            {"quantity_sold": quantity, "total_revenue": revenue, "total_cost": cost}
+        )
+
+
+def record_expense(db: Session, db_expense: models.Expense):
+    """Fold a newly inserted expense into the daily rollup."""
+    record_expenses(db, [db_expense])
+
+
+def record_expenses(db: Session, expenses):
+    """Fold a batch of expenses into the rollup, one upsert per day and category."""
+    per_category = {}
+    for db_expense in expenses:
+        key = (db_expense.expense_date, db_expense.category_id or 0)
+        count, total = per_category.get(key, (0, Decimal("0")))
+        per_category[key] = (count + 1, total + db_expense.amount)
+
+    for (expense_date, category_id), (count, total) in per_category.items():
+        _upsert_increment(
+            db, models.ExpenseDailyRollup,
+            {"expense_date": expense_date, "category_id": category_id},
+            {"expense_count": count, "total_amount": total}
+        )
+
+
+def rebuild(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """Recompute the rollups for a date range (all history by default) from the raw tables."""
+
+    def date_filter(column):
+        conditions = []
+        if start_date:
+            conditions.append(column >= start_date)
+        if end_date:
+            conditions.append(column <= end_date)
+        return and_(true(), *conditions)
+
+    db.execute(delete(models.SalesDailyRollup).where(date_filter(models.SalesDailyRollup.sale_date)))
+    db.execute(delete(models.ProductSalesDailyRollup).where(date_filter(models.ProductSalesDailyRollup.sale_date)))
+    db.execute(delete(models.ExpenseDailyRollup).where(date_filter(models.ExpenseDailyRollup.expense_date)))
+
+    db.execute(insert(models.SalesDailyRollup).from_select(
+        ["sale_date", "payment_method", "sale_count", "total_amount", "discount_amount", "tax_amount"],
+        select(
+            models.Sale.sale_date,
+            models.Sale.payment_method,
+            func.count(models.Sale.id),
+            func.coalesce(func.sum(models.Sale.total_amount), 0),
+            func.coalesce(func.sum(models.Sale.discount_amount), 0),
+            func.coalesce(func.sum(models.Sale.tax_amount), 0)
+        ).where(date_filter(models.Sale.sale_date)).group_by(models.Sale.sale_date, models.Sale.payment_method)
+    ))
+
+    db.execute(insert(models.ProductSalesDailyRollup).from_select(
+        ["sale_date", "product_id", "quantity_sold", "total_revenue", "total_cost"],
+        select(
+            models.Sale.sale_date,
+            models.SaleItem.product_id,
+            func.sum(models.SaleItem.quantity),
+            func.sum(models.SaleItem.total_price),
+            func.sum(models.SaleItem.cost_price * models.SaleItem.quantity)
+        ).join(models.Sale, models.SaleItem.sale_id == models.Sale.id)
+        .where(date_filter(models.Sale.sale_date))
+        .group_by(models.Sale.sale_date, models.SaleItem.product_id)
+    ))
+
+    db.execute(insert(models.ExpenseDailyRollup).from_select(
+        ["expense_date", "category_id", "expense_count", "total_amount"],
+        select(
+            models.Expense.expense_date,
+            func.coalesce(models.Expense.category_id, 0),
+            func.count(models.Expense.id),
+            func.sum(models.Expense.amount)
+        ).where(date_filter(models.Expense.expense_date))
+        .group_by(models.Expense.expense_date, func.coalesce(models.Expense.category_id, 0))
+    ))
+
+    _rebuild_product_totals(db)
+    # Rebuilds follow out-of-band writes (bulk SQL loads), so invalidate every validator
+    versions.bump(db, *versions.TABLES)
+    db.commit()
+    logger.info(f"Rebuilt daily rollups (start={start_date}, end={end_date})")
+
+
+def _rebuild_product_totals(db: Session):
+    """Recompute lifetime per-product totals from the (already rebuilt) daily product rollup."""
+    db.execute(delete(models.ProductSalesTotal))
+    db.execute(insert(models.ProductSalesTotal).from_select(
+        ["product_id", "quantity_sold", "total_revenue", "total_cost"],
+        select(
+            models.ProductSalesDailyRollup.product_id,
+            func.sum(models.ProductSalesDailyRollup.quantity_sold),
+            func.sum(models.ProductSalesDailyRollup.total_revenue),
+            func.sum(models.ProductSalesDailyRollup.total_cost)
+        ).group_by(models.ProductSalesDailyRollup.product_id)
+    ))
+
+
+def ensure_populated(db: Session):
+    """Rebuild once if the rollups are empty but transactions exist (e.g. SQL-loaded sample data)."""
+    rollups_empty = (
+        db.execute(select(models.SalesDailyRollup.sale_date).limit(1)).first() is None
+        and db.execute(select(models.ExpenseDailyRollup.expense_date).limit(1)).first() is None
+    )
+    has_transactions = (
+        db.execute(select(models.Sale.id).limit(1)).first() is not None
+        or db.execute(select(models.Expense.id).limit(1)).first() is not None
+    )
+    if rollups_empty and has_transactions:
+        logger.info("Daily rollups are empty, rebuilding from transaction history")
+        rebuild(db)
+    elif (db.execute(select(models.ProductSalesTotal.product_id).limit(1)).first() is None
+          and db.execute(select(models.ProductSalesDailyRollup.product_id).limit(1)).first() is not None):
+        logger.info("Product sales totals are empty, rebuilding from the daily rollup")
+        _rebuild_product_totals(db)
+        versions.bump(db, "sales")
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain SmartTrack daily rollup tables")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = subparsers.add_parser("rebuild", help="Recompute rollups from raw sales and expenses")
+    rebuild_parser.add_argument("--start", type=date.fromisoformat, default=None)
+    rebuild_parser.add_argument("--end", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    from .database import SessionLocal, Base, engine
+    logging.basicConfig(level=logging.INFO)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        rebuild(db, start_date=args.start, end_date=args.end)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,62 @@
 import logging
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db, run_db
 from .. import crud
+from ..responses import FastJSONResponse
+from ..versions import conditional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/dashboard/summary")
+@router.get("/dashboard/summary", response_class=FastJSONResponse,
+            dependencies=[Depends(conditional("sales", "expenses", "products", daily=True))])
 async def get_dashboard_summary(db: Session = Depends(get_db)):
     try:
-        summary = crud.get_dashboard_summary(db)
+        summary = await run_db(crud.get_dashboard_summary, db)
         summary["generated_at"] = datetime.now().isoformat()
         return summary
     except Exception as e:
         logger.error(f"Error in get_dashboard_summary: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch dashboard summary")
 
-@router.get("/products/profit")
-async def get_product_profit_analysis(db: Session = Depends(get_db)):
+@router.get("/products/profit", response_class=FastJSONResponse,
+            dependencies=[Depends(conditional("sales", "products", "categories"))])
+async def get_product_profit_analysis(
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    category_id: Optional[int] = Query(None),
+    sort_by: str = Query("profit", regex="^(profit|revenue|quantity|margin|cost|name)$"),
+    order: str = Query("desc", regex="^(asc|desc)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000, description="Page size; with skip=0 this is the top-N"),
+    db: Session = Depends(get_db)
+):
     try:
-        return {"data": crud.get_product_profit_analysis(db)}
+        result = await run_db(crud.get_product_profit_analysis, db, start_date=start, end_date=end,
+                              category_id=category_id, sort_by=sort_by, order=order, skip=skip, limit=limit)
+        result.update({"skip": skip, "limit": limit})
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_product_profit_analysis: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch product profit analysis")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch product profit analysis")
+
+@router.get("/trends", response_class=FastJSONResponse,
+            dependencies=[Depends(conditional("sales", "expenses", daily=True))])
+async def get_trends(
+    granularity: str = Query("month", regex="^(day|week|month)$"),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    db: Session = Depends(get_db)
+):
+    try:
+        return await run_db(crud.get_trends, db, granularity=granularity, start_date=start, end_date=end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in get_trends: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch trends")
\ No newline at end of file
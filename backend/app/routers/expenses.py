@@ -1,25 +1,48 @@
 import logging
 from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from ..database import get_db
-from .. import crud, schemas
+from ..database import get_db, run_db
+from .. import crud, exporters, importers, schemas
+from ..responses import FAST_JSON_ENABLED, rows_response
+from ..versions import conditional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Expense])
+@router.get("/", response_model=List[schemas.Expense],
+            dependencies=[Depends(conditional("expenses", "categories"))])
 async def get_expenses(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return; "
+                                                    "key fields are always included"),
+    view: str = Query("full", regex="^(summary|full)$",
+                      description="summary returns scalar columns only, without nested objects"),
+    decimals: Optional[str] = Query(None, regex="^(string|float)$",
+                                    description="Render Decimal fields as strings (default) or JSON numbers"),
     db: Session = Depends(get_db)
 ):
     try:
-        expenses = crud.get_expenses(db, skip=skip, limit=limit, start_date=start_date, end_date=end_date)
+        selected = crud.resolve_fields(schemas.Expense, fields, view, crud.EXPENSE_SUMMARY_FIELDS,
+                                       crud.EXPENSE_KEY_FIELDS)
+        expenses = await run_db(crud.get_expenses_rows, db, skip=skip, limit=limit, start_date=start_date,
+                                end_date=end_date, cursor=cursor, fields=selected)
+        if len(expenses) == limit:
+            last = expenses[-1]
+            response.headers["X-Next-Cursor"] = crud.encode_cursor(last["expense_date"], last["id"])
+        # Sparse rows do not match the full response_model, so always send them as-is
+        if FAST_JSON_ENABLED or selected is not None:
+            return rows_response(expenses, headers=dict(response.headers), decimals=decimals)
         return expenses
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_expenses: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch expenses")
@@ -27,7 +50,35 @@ async def get_expenses(
 @router.post("/", response_model=schemas.Expense)
 async def create_expense(expense: schemas.ExpenseCreate, db: Session = Depends(get_db)):
     try:
-        return crud.create_expense(db=db, expense=expense)
+        return await run_db(crud.create_expense, db=db, expense=expense)
     except Exception as e:
         logger.error(f"Error in create_expense: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to create expense")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to create expense")
+
+@router.post("/import", response_model=schemas.ImportResult)
+async def import_expenses(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, regex="^(csv|ndjson)$"),
+    db: Session = Depends(get_db)
+):
+    fmt = format or importers.detect_format(file.filename, file.content_type)
+    if not fmt:
+        raise HTTPException(status_code=400, detail="Unknown file format; pass format=csv or format=ndjson")
+    try:
+        return await run_db(crud.import_expenses, db, importers.iter_records(file.file, fmt))
+    except Exception as e:
+        logger.error(f"Error in import_expenses: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to import expenses")
+
+@router.get("/export")
+async def export_expenses(
+    format: str = Query("csv", regex="^(csv|ndjson)$"),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    filename = exporters.export_filename("expenses", format, start_date, end_date)
+    return StreamingResponse(
+        exporters.stream_expenses(format, start_date=start_date, end_date=end_date),
+        media_type=exporters.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
\ No newline at end of file
@@ -1,32 +1,53 @@
 # backend/app/routers/products.py
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, Response
 from sqlalchemy.orm import Session
-from ..database import get_db
-from .. import crud, schemas
+from ..database import get_db, run_db
+from .. import crud, importers, schemas
+from ..cache import catalog_cache
+from ..responses import FAST_JSON_ENABLED, list_response, rows_response
+from ..versions import conditional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Product])
+@router.get("/", response_model=List[schemas.Product],
+            dependencies=[Depends(conditional("products", "categories"))])
 async def get_products(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     active_only: bool = Query(True),
+    fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return; "
+                                                    "key fields are always included"),
+    view: str = Query("full", regex="^(summary|full)$",
+                      description="summary returns scalar columns only, without nested objects"),
+    decimals: Optional[str] = Query(None, regex="^(string|float)$",
+                                    description="Render Decimal fields as strings (default) or JSON numbers"),
     db: Session = Depends(get_db)
 ):
     try:
-        products = crud.get_products(db, skip=skip, limit=limit, active_only=active_only)
+        selected = crud.resolve_fields(schemas.Product, fields, view, crud.PRODUCT_SUMMARY_FIELDS,
+                                       crud.PRODUCT_KEY_FIELDS)
+        products = await run_db(crud.get_products, db, skip=skip, limit=limit, active_only=active_only,
+                                fields=selected)
+        if selected is not None:
+            return rows_response(products, headers=dict(response.headers), decimals=decimals)
+        if FAST_JSON_ENABLED:
+            return list_response(schemas.Product, products, headers=dict(response.headers), decimals=decimals)
         return products
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_products: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch products")
 
-@router.get("/{product_id}", response_model=schemas.Product)
+@router.get("/{product_id}", response_model=schemas.Product,
+            dependencies=[Depends(conditional("products", "categories"))])
 async def get_product(product_id: int, db: Session = Depends(get_db)):
     try:
-        product = crud.get_product(db, product_id=product_id)
+        product = await run_db(crud.get_product, db, product_id=product_id)
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         return product
@@ -39,12 +60,28 @@ async def get_product(product_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=schemas.Product)
 async def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)):
     try:
-        return crud.create_product(db=db, product=product)
+        return await run_db(crud.create_product, db=db, product=product)
     except Exception as e:
         logger.error(f"Error in create_product: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create product")
 
-@router.get("/categories/", response_model=List[schemas.Category])
+@router.post("/import", response_model=schemas.ImportResult)
+async def import_products(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, regex="^(csv|ndjson)$"),
+    db: Session = Depends(get_db)
+):
+    fmt = format or importers.detect_format(file.filename, file.content_type)
+    if not fmt:
+        raise HTTPException(status_code=400, detail="Unknown file format; pass format=csv or format=ndjson")
+    try:
+        return await run_db(crud.import_products, db, importers.iter_records(file.file, fmt))
+    except Exception as e:
+        logger.error(f"Error in import_products: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to import products")
+
+@router.get("/categories/", response_model=List[schemas.Category],
+            dependencies=[Depends(conditional("categories"))])
 async def get_categories(
     category_type: Optional[str] = Query(None, regex="^(expense|product)$"),
     skip: int = Query(0, ge=0),
@@ -52,7 +89,7 @@ async def get_categories(
     db: Session = Depends(get_db)
 ):
     try:
-        return crud.get_categories(db, category_type=category_type, skip=skip, limit=limit)
+        return await run_db(crud.get_categories, db, category_type=category_type, skip=skip, limit=limit)
     except Exception as e:
         logger.error(f"Error in get_categories: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch categories")
@@ -60,7 +97,11 @@ async def get_categories(
 @router.post("/categories/", response_model=schemas.Category)
 async def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_db)):
     try:
-        return crud.create_category(db=db, category=category)
+        return await run_db(crud.create_category, db=db, category=category)
     except Exception as e:
         logger.error(f"Error in create_category: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to create category")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to create category")
+
+@router.get("/cache/stats")
+async def get_catalog_cache_stats():
+    return catalog_cache.stats()
\ No newline at end of file
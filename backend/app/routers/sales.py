@@ -3,26 +3,48 @@
 import logging
 from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from ..database import get_db
-from .. import crud, schemas
+from ..database import get_db, run_db
+from .. import crud, exporters, schemas
+from ..responses import FAST_JSON_ENABLED, rows_response
+from ..versions import conditional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.Sale])
+@router.get("/", response_model=List[schemas.Sale],
+            dependencies=[Depends(conditional("sales", "products", "categories"))])
 async def get_sales(
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=1000),
         start_date: Optional[date] = Query(None),
         end_date: Optional[date] = Query(None),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+        fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return; "
+                                                        "key fields are always included"),
+        view: str = Query("full", regex="^(summary|full)$",
+                          description="summary returns scalar columns only, without nested objects"),
+        decimals: Optional[str] = Query(None, regex="^(string|float)$",
+                                        description="Render Decimal fields as strings (default) or JSON numbers"),
         db: Session = Depends(get_db)
 ):
     try:
-        sales = crud.get_sales(db, skip=skip, limit=limit, start_date=start_date, end_date=end_date)
+        selected = crud.resolve_fields(schemas.Sale, fields, view, crud.SALE_SUMMARY_FIELDS, crud.SALE_KEY_FIELDS)
+        sales = await run_db(crud.get_sales_rows, db, skip=skip, limit=limit, start_date=start_date,
+                             end_date=end_date, cursor=cursor, fields=selected)
+        if len(sales) == limit:
+            last = sales[-1]
+            response.headers["X-Next-Cursor"] = crud.encode_cursor(last["sale_date"], last["id"])
+        # Sparse rows do not match the full response_model, so always send them as-is
+        if FAST_JSON_ENABLED or selected is not None:
+            return rows_response(sales, headers=dict(response.headers), decimals=decimals)
         return sales
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_sales: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch sales")
@@ -31,18 +53,36 @@ async def get_sales(
 @router.post("/", response_model=schemas.Sale)
 async def create_sale(sale: schemas.SaleCreate, db: Session = Depends(get_db)):
     try:
-        for item in sale.items:
-            product = crud.get_product(db, item.product_id)
-            if not product:
-                raise HTTPException(status_code=400, detail=f"Product with ID {item.product_id} not found")
-            if not product.is_active:
-                raise HTTPException(status_code=400, detail=f"Product {product.name} is not active")
-            if product.current_stock < item.quantity:
-                raise HTTPException(status_code=400, detail=f"Insufficient stock for {product.name}")
-
-        return crud.create_sale(db=db, sale=sale)
-    except HTTPException:
-        raise
+        return await run_db(crud.create_sale, db=db, sale=sale)
+    except crud.SaleValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in create_sale: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to create sale")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to create sale")
+
+
+@router.post("/bulk", response_model=schemas.SaleBulkResult)
+async def create_sales_bulk(payload: schemas.SaleBulkCreate, db: Session = Depends(get_db)):
+    try:
+        result = await run_db(crud.create_sales_bulk, db=db, sales=payload.sales)
+        logger.info(f"Bulk sale upload: {result['created']} created, {result['failed']} failed")
+        return result
+    except crud.SaleValidationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in create_sales_bulk: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to create sales")
+
+
+@router.get("/export")
+async def export_sales(
+        format: str = Query("csv", regex="^(csv|ndjson)$"),
+        start_date: Optional[date] = Query(None),
+        end_date: Optional[date] = Query(None)
+):
+    filename = exporters.export_filename("sales", format, start_date, end_date)
+    return StreamingResponse(
+        exporters.stream_sales(format, start_date=start_date, end_date=end_date),
+        media_type=exporters.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
\ No newline at end of file
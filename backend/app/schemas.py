@@ -122,8 +122,8 @@ class SaleBase(BaseModel):
     sale_date: date
     payment_method: PaymentMethod = PaymentMethod.cash
     customer_name: Optional[str] = None
-    discount_amount: Decimal = 0.00
-    tax_amount: Decimal = 0.00
+    discount_amount: Decimal = Decimal("0.00")
+    tax_amount: Decimal = Decimal("0.00")
     notes: Optional[str] = None
 
 
@@ -131,6 +131,34 @@ class SaleCreate(SaleBase):
     items: List[SaleItemCreate]
 
 
+MAX_BULK_SALES = 5000
+
+
+class SaleBulkCreate(BaseModel):
+    sales: List[SaleCreate]
+
+    @validator('sales')
+    def validate_batch_size(cls, v):
+        if not v:
+            raise ValueError('At least one sale is required')
+        if len(v) > MAX_BULK_SALES:
+            raise ValueError(f'At most {MAX_BULK_SALES} sales can be uploaded per request')
+        return v
+
+
+class SaleBulkItemResult(BaseModel):
+    index: int
+    success: bool
+    sale_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class SaleBulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[SaleBulkItemResult]
+
+
 class Sale(SaleBase):
     id: int
     total_amount: Decimal
@@ -139,4 +167,17 @@ class Sale(SaleBase):
     sale_items: List[SaleItem] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    processed: int
+    inserted: int
+    duplicates: int
+    failed: int
+    errors: List[ImportRowError] = []
@@ -0,0 +1,337 @@
+"""In-process runtime telemetry for the SmartTrack backend.
+
+Metrics are plain counters guarded by a lock and rendered on demand in the
+Prometheus text exposition format, so the hot path costs a few dictionary
+updates per request and no extra dependency is needed.
+"""
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Upper bounds (seconds) of the connection checkout wait histogram buckets
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+# Upper bounds (seconds) of the request latency histogram buckets (Prometheus defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class PoolMetrics:
+    """Connection pool counters fed by SQLAlchemy pool events and checkout timing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.engine = None
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checkout_timeouts = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_bucket_counts = [0] * len(POOL_WAIT_BUCKETS)
+
+    def attach(self, engine):
+        """Subscribe to the pool events of ``engine``."""
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connections_opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for index, upper_bound in enumerate(POOL_WAIT_BUCKETS):
+                if seconds <= upper_bound:
+                    self.wait_bucket_counts[index] += 1
+                    break
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def snapshot(self) -> dict:
+        # Read through the engine: dispose() swaps in a recreated pool
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            data = {
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "connections_opened": self.connections_opened,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checkout_timeouts": self.checkout_timeouts,
+                "wait": {
+                    "count": self.wait_count,
+                    "total_seconds": round(self.wait_seconds_total, 6),
+                    "max_seconds": round(self.wait_seconds_max, 6),
+                    "buckets": dict(zip((str(bound) for bound in POOL_WAIT_BUCKETS), self.wait_bucket_counts)),
+                },
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long callers wait for a connection and counts checkout timeouts."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class QueryStats:
+    """Statement count and cumulative database time of one request."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Set by MetricsMiddleware for the duration of a request; engine events in
+# ``database`` add to it (``run_db`` carries the context into worker threads).
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+class RequestMetrics:
+    """Per-route request counts, latency histograms and database usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], List] = {}
+        self.db_queries: Dict[Tuple[str, str], int] = {}
+        self.db_seconds: Dict[Tuple[str, str], float] = {}
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float, query_stats: QueryStats):
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+            for index, upper_bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= upper_bound:
+                    histogram[0][index] += 1
+                    break
+            histogram[1] += seconds
+            histogram[2] += 1
+            self.db_queries[key] = self.db_queries.get(key, 0) + query_stats.count
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + query_stats.seconds
+
+    def render(self) -> List[str]:
+        with self._lock:
+            requests = dict(self.requests)
+            latency = {key: ([*value[0]], value[1], value[2]) for key, value in self.latency.items()}
+            db_queries = dict(self.db_queries)
+            db_seconds = dict(self.db_seconds)
+            in_flight = self.in_flight
+
+        lines = [
+            "# HELP smarttrack_http_requests_in_flight Requests currently being served.",
+            "# TYPE smarttrack_http_requests_in_flight gauge",
+            f"smarttrack_http_requests_in_flight {in_flight}",
+            "# HELP smarttrack_http_requests_total Requests served, by route and status.",
+            "# TYPE smarttrack_http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(requests.items()):
+            lines.append(f"smarttrack_http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines += [
+            "# HELP smarttrack_http_request_errors_total Requests answered with a 4xx or 5xx status.",
+            "# TYPE smarttrack_http_request_errors_total counter",
+        ]
+        for (method, route, status), count in sorted(requests.items()):
+            if status >= 400:
+                lines.append(
+                    f"smarttrack_http_request_errors_total{_labels(method=method, route=route, status=status)} {count}"
+                )
+
+        lines += [
+            "# HELP smarttrack_http_request_duration_seconds Request latency, by route.",
+            "# TYPE smarttrack_http_request_duration_seconds histogram",
+        ]
+        for (method, route), (buckets, total, count) in sorted(latency.items()):
+            cumulative = 0
+            for upper_bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += bucket_count
+                lines.append(
+                    f"smarttrack_http_request_duration_seconds_bucket"
+                    f"{_labels(method=method, route=route, le=upper_bound)} {cumulative}"
+                )
+            lines.append(
+                f"smarttrack_http_request_duration_seconds_bucket"
+                f"{_labels(method=method, route=route, le='+Inf')} {count}"
+            )
+            labels = _labels(method=method, route=route)
+            lines.append(f"smarttrack_http_request_duration_seconds_sum{labels} {total:.6f}")
+            lines.append(f"smarttrack_http_request_duration_seconds_count{labels} {count}")
+
+        lines += [
+            "# HELP smarttrack_db_queries_total SQL statements executed, by route.",
+            "# TYPE smarttrack_db_queries_total counter",
+        ]
+        for (method, route), count in sorted(db_queries.items()):
+            lines.append(f"smarttrack_db_queries_total{_labels(method=method, route=route)} {count}")
+        lines += [
+            "# HELP smarttrack_db_query_seconds_total Time spent executing SQL statements, by route.",
+            "# TYPE smarttrack_db_query_seconds_total counter",
+        ]
+        for (method, route), seconds in sorted(db_seconds.items()):
+            lines.append(f"smarttrack_db_query_seconds_total{_labels(method=method, route=route)} {seconds:.6f}")
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _render_pool_metrics() -> List[str]:
+    snapshot = pool_metrics.snapshot()
+    lines = []
+    for name, kind, help_text in (
+        ("checked_out", "gauge", "Connections currently checked out of the pool."),
+        ("checked_in", "gauge", "Idle connections held by the pool."),
+        ("overflow", "gauge", "Connections open beyond the pool size."),
+        ("checkout_timeouts", "counter", "Checkouts that gave up after the pool timeout."),
+        ("connections_opened", "counter", "New DBAPI connections opened."),
+    ):
+        if name in snapshot:
+            metric = f"smarttrack_db_pool_{name}" + ("_total" if kind == "counter" else "")
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}", f"{metric} {snapshot[name]}"]
+
+    wait = snapshot["wait"]
+    lines += [
+        "# HELP smarttrack_db_pool_wait_seconds Time spent waiting to check out a connection.",
+        "# TYPE smarttrack_db_pool_wait_seconds histogram",
+    ]
+    cumulative = 0
+    for upper_bound, bucket_count in zip(POOL_WAIT_BUCKETS, wait["buckets"].values()):
+        cumulative += bucket_count
+        lines.append(f"smarttrack_db_pool_wait_seconds_bucket{_labels(le=upper_bound)} {cumulative}")
+    lines.append(f"smarttrack_db_pool_wait_seconds_bucket{_labels(le='+Inf')} {wait['count']}")
+    lines.append(f"smarttrack_db_pool_wait_seconds_sum {wait['total_seconds']}")
+    lines.append(f"smarttrack_db_pool_wait_seconds_count {wait['count']}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """All request and pool metrics in the Prometheus text exposition format."""
+    return "\n".join(request_metrics.render() + _render_pool_metrics()) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding ``request_metrics``; routes are labelled by their path template.
+
+    With ``query_headers`` it also reports the request's SQL statement count and
+    time as ``X-DB-Queries`` / ``X-DB-Time-ms`` (for streamed bodies, only the
+    statements issued before the headers were sent are counted).
+    """
+
+    def __init__(self, app, record_metrics: bool = True, query_headers: bool = False):
+        self.app = app
+        self.record_metrics = record_metrics
+        self.query_headers = query_headers
+        self._route_paths = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        query_stats = QueryStats()
+        token = current_query_stats.set(query_stats)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.query_headers:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-queries", str(query_stats.count).encode()),
+                        (b"x-db-time-ms", f"{query_stats.seconds * 1000:.2f}".encode()),
+                    ]
+            await send(message)
+
+        if self.record_metrics:
+            request_metrics.started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if self.record_metrics:
+                request_metrics.finished(
+                    scope["method"], self._route(scope), status, time.perf_counter() - start, query_stats
+                )
+            current_query_stats.reset(token)
+
+    def _route(self, scope) -> str:
+        # The router stores the matched endpoint in the scope; label by its path
+        # template so /products/{product_id} stays a single series.
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path for route in scope["app"].routes if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
@@ -0,0 +1,128 @@
+"""Per-table version counters and the HTTP validators derived from them.
+
+Every write in ``crud`` bumps the counter of each table it touches inside its
+own transaction, so a committed change is always visible as a new version.
+GET endpoints depend on ``conditional(...)``, which reads the few counters
+they are built from (one primary-key lookup), derives a weak ``ETag`` and a
+``Last-Modified`` from them and answers ``If-None-Match`` /
+``If-Modified-Since`` with 304 before the endpoint body, and its query, runs.
+
+The counters are read before the endpoint's own query, so a response is never
+newer than its validator; a write landing in between only costs the client
+one extra full response.
+"""
+import hashlib
+import os
+import threading
+from datetime import date, datetime, time, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from . import models, rollups
+from .cache import catalog_cache, invalidate_categories
+from .database import get_db, run_db
+
+# Set to false to always run the query and send the full response
+CONDITIONAL_GET_ENABLED = os.getenv("CONDITIONAL_GET_ENABLED", "true").lower() == "true"
+
+TABLES = ("categories", "products", "sales", "expenses")
+
+
+def bump(db: Session, *tables: str):
+    """Increment the counters of ``tables``; call before the write's commit."""
+    now = datetime.utcnow().replace(microsecond=0)
+    # Fixed order so concurrent writers lock the counter rows the same way
+    for table in sorted(set(tables)):
+        rollups._upsert_increment(db, models.TableVersion, {"table_name": table}, {"version": 1},
+                                  assignments={"updated_at": now})
+
+
+def read(db: Session, tables: Iterable[str]) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """``{table: (version, updated_at)}``; tables never written read as ``(0, None)``."""
+    tables = tuple(tables)
+    rows = db.execute(
+        select(models.TableVersion.table_name, models.TableVersion.version, models.TableVersion.updated_at)
+        .where(models.TableVersion.table_name.in_(tables))
+    ).all()
+    state = {table: (0, None) for table in tables}
+    state.update({row.table_name: (row.version, row.updated_at) for row in rows})
+    return state
+
+
+_observed: Dict[str, int] = {}
+_observed_lock = threading.Lock()
+
+
+def _sync_catalog_cache(state: dict):
+    """Drop this worker's catalog cache when another worker changed the catalog.
+
+    Without this a worker could serve a cached product list under the new
+    validator until its TTL ran out, and clients would keep that stale copy.
+    """
+    with _observed_lock:
+        changed = {table for table in ("products", "categories")
+                   if table in state and _observed.get(table) != state[table][0]}
+        _observed.update({table: state[table][0] for table in changed})
+    if "categories" in changed:
+        invalidate_categories()
+    elif "products" in changed:
+        # Any product may have changed (e.g. stock), so detail entries go as well as lists
+        catalog_cache.invalidate_where(lambda key: key[0] in ("products", "product"))
+
+
+def _etag(request: Request, state: dict, today: Optional[date]) -> str:
+    parts = [request.url.path, repr(sorted(request.query_params.multi_items()))]
+    parts += [f"{table}:{version}:{updated_at}" for table, (version, updated_at) in sorted(state.items())]
+    if today:
+        parts.append(today.isoformat())
+    return 'W/"%s"' % hashlib.sha1("|".join(parts).encode()).hexdigest()[:24]
+
+
+def _last_modified(state: dict, today: Optional[date]) -> Optional[datetime]:
+    stamps = [updated_at.replace(tzinfo=timezone.utc) for _, updated_at in state.values() if updated_at]
+    if today:
+        # Day-relative figures change at local midnight even without writes
+        stamps.append(datetime.combine(today, time.min).astimezone(timezone.utc))
+    return max(stamps) if stamps else None
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison: the W/ prefix is ignored on both sides
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional(*tables: str, daily: bool = False):
+    """Dependency adding ``ETag`` / ``Last-Modified`` built from ``tables`` and answering 304.
+
+    ``daily`` marks responses with figures relative to today (dashboard totals,
+    default trend windows), whose validators must also change with the date.
+    Routes returning a ``Response`` themselves must copy ``response.headers``.
+    """
+    async def check_validators(request: Request, response: Response, db: Session = Depends(get_db)):
+        if not CONDITIONAL_GET_ENABLED:
+            return
+        state = await run_db(read, db, tables)
+        _sync_catalog_cache(state)
+        today = date.today() if daily else None
+        etag = _etag(request, state, today)
+        last_modified = _last_modified(state, today)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if last_modified:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+        if _not_modified(request, etag, last_modified):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return check_validators
@@ -0,0 +1,69 @@
+"""Sale ingestion throughput: one POST per sale vs ``POST /api/v1/sales/bulk``.
+
+    python -m benchmarks.bench_bulk_sales --sales 2000 --batch-size 500
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+from .common import Server, seed_database, sqlite_url, timed_request
+
+
+def make_sales(count: int, n_products: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        {
+            "sale_date": str(date.today()),
+            "payment_method": rng.choice(["cash", "card", "mobile_money"]),
+            "discount_amount": 0,
+            "tax_amount": 0,
+            "items": [
+                {"product_id": rng.randint(1, n_products), "quantity": rng.randint(1, 3),
+                 "unit_price": 800, "cost_price": 300}
+                for _ in range(rng.randint(1, 4))
+            ],
+        }
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sales", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--products", type=int, default=200)
+    args = parser.parse_args()
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_products=args.products, n_sales=1000)
+    sales = make_sales(args.sales, args.products)
+
+    with Server(database_url) as server:
+        start = time.perf_counter()
+        for sale in sales:
+            timed_request(f"{server.base_url}/api/v1/sales/", method="POST", body=sale)
+        single_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for offset in range(0, len(sales), args.batch_size):
+            timed_request(f"{server.base_url}/api/v1/sales/bulk", method="POST",
+                          body={"sales": sales[offset:offset + args.batch_size]})
+        bulk_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "benchmark": "bulk_sales",
+        "sales": args.sales,
+        "batch_size": args.batch_size,
+        "results": {
+            "single": {"seconds": round(single_seconds, 3), "sales_per_second": round(args.sales / single_seconds, 1)},
+            "bulk": {"seconds": round(bulk_seconds, 3), "sales_per_second": round(args.sales / bulk_seconds, 1)},
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Parallel checkout stress test and throughput benchmark.
+
+Fires more concurrent single-item checkouts at one product than it has stock
+and verifies that exactly the available stock was sold: no overselling, no
+negative stock, and every accepted sale recorded. Exits non-zero on any
+inconsistency.
+
+    python -m benchmarks.bench_checkout_concurrency --stock 200 --concurrency 16
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from sqlalchemy import func, select, update
+
+from .common import Server, seed_database, sqlite_url, summarize, timed_request
+
+
+def checkout(base_url: str, product_id: int):
+    sale = {
+        "sale_date": str(date.today()),
+        "payment_method": "cash",
+        "items": [{"product_id": product_id, "quantity": 1, "unit_price": 800, "cost_price": 300}],
+    }
+    try:
+        return 200, timed_request(f"{base_url}/api/v1/sales/", method="POST", body=sale)
+    except urllib.error.HTTPError as e:
+        return e.code, 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stock", type=int, default=200)
+    parser.add_argument("--attempts", type=int, default=None, help="defaults to twice the stock")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    attempts = args.attempts or args.stock * 2
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_sales=100)
+
+    from app.database import engine
+    from app import models
+    with engine.begin() as conn:
+        conn.execute(update(models.Product).where(models.Product.id == 1).values(current_stock=args.stock))
+        sold_before = conn.scalar(select(func.coalesce(func.sum(models.SaleItem.quantity), 0))
+                                  .where(models.SaleItem.product_id == 1))
+
+    with Server(database_url) as server:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            outcomes = list(pool.map(lambda _: checkout(server.base_url, 1), range(attempts)))
+        elapsed = time.perf_counter() - start
+
+    with engine.connect() as conn:
+        final_stock = conn.scalar(select(models.Product.current_stock).where(models.Product.id == 1))
+        sold = conn.scalar(select(func.coalesce(func.sum(models.SaleItem.quantity), 0))
+                           .where(models.SaleItem.product_id == 1)) - sold_before
+
+    statuses = {}
+    for status, _ in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    accepted = statuses.get("200", 0)
+    consistent = (
+        final_stock >= 0
+        and sold == accepted
+        and sold + final_stock == args.stock
+        and set(statuses) <= {"200", "400"}
+    )
+
+    print(json.dumps({
+        "benchmark": "checkout_concurrency",
+        "stock": args.stock,
+        "attempts": attempts,
+        "concurrency": args.concurrency,
+        "statuses": statuses,
+        "units_sold": sold,
+        "final_stock": final_stock,
+        "consistent": consistent,
+        "checkouts_per_second": round(attempts / elapsed, 1),
+        "accepted_latency": summarize([latency for status, latency in outcomes if status == 200]),
+    }, indent=2))
+    sys.exit(0 if consistent else 1)
+
+
+if __name__ == "__main__":
+    main()
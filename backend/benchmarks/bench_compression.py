@@ -0,0 +1,112 @@
+"""Bytes on the wire and end-to-end latency of the big list endpoints per encoding.
+
+Requests each endpoint with ``Accept-Encoding: identity`` and with every
+encoding the backend can produce here (gzip, plus br / zstd when brotli /
+zstandard are installed). Latency covers the request, the transfer over
+loopback and client-side decoding; ``est_ms_at_link`` adds the time the wire
+bytes would take on a ``--link-mbps`` connection, which is where compression
+pays off between containers on different hosts or for remote browsers.
+
+    python -m benchmarks.bench_compression --sales 5000 --repeat 10 --link-mbps 100
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+import zlib
+
+from .common import Server, seed_database, sqlite_url
+
+ENDPOINTS = {
+    "sales_full_1000": "/api/v1/sales/?limit=1000",
+    "sales_summary_1000": "/api/v1/sales/?limit=1000&view=summary",
+    "expenses_1000": "/api/v1/expenses/?limit=1000",
+    "products_1000": "/api/v1/products/?limit=1000",
+    "sales_export_ndjson": "/api/v1/sales/export?format=ndjson",
+}
+
+
+def decoders():
+    available = {"identity": lambda body: body, "gzip": lambda body: zlib.decompress(body, zlib.MAX_WBITS | 16)}
+    try:
+        import brotli
+        available["br"] = brotli.decompress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        available["zstd"] = lambda body: zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    except ImportError:
+        pass
+    return available
+
+
+def fetch(url: str, encoding: str, decode):
+    """Latency in ms, bytes received and decoded body for one request."""
+    request = urllib.request.Request(url, headers={"Accept-Encoding": encoding})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=120) as response:
+        raw = response.read()
+        served = response.headers.get("Content-Encoding", "identity")
+    if served != encoding:
+        raise RuntimeError(f"Asked for {encoding}, got {served} from {url}")
+    body = decode(raw)
+    return (time.perf_counter() - start) * 1000, len(raw), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sales", type=int, default=5000)
+    parser.add_argument("--expenses", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--link-mbps", type=float, default=100.0, help="bandwidth for the transfer-time estimate")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_products=1000, n_sales=args.sales, n_expenses=args.expenses)
+
+    encodings = decoders()
+    results = {}
+    identical = True
+    with Server(database_url, port=args.port) as server:
+        for name, path in ENDPOINTS.items():
+            url = f"{server.base_url}{path}"
+            entry = {}
+            reference = None
+            for encoding, decode in encodings.items():
+                fetch(url, encoding, decode)  # warm up
+                latencies, wire_bytes = [], 0
+                for _ in range(args.repeat):
+                    latency, wire_bytes, body = fetch(url, encoding, decode)
+                    latencies.append(latency)
+                reference = reference if reference is not None else body
+                identical = identical and body == reference
+                median_ms = statistics.median(latencies)
+                entry[encoding] = {
+                    "wire_bytes": wire_bytes,
+                    "median_ms": round(median_ms, 2),
+                    "est_ms_at_link": round(median_ms + wire_bytes * 8 / (args.link_mbps * 1000), 2),
+                }
+            for encoding, stats in entry.items():
+                stats["ratio"] = round(entry["identity"]["wire_bytes"] / stats["wire_bytes"], 2)
+            results[name] = entry
+
+    print(json.dumps({
+        "benchmark": "compression",
+        "sales": args.sales,
+        "repeat": args.repeat,
+        "link_mbps": args.link_mbps,
+        "encodings": list(encodings),
+        "identical_bodies": identical,
+        "results": results,
+    }, indent=2))
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main()
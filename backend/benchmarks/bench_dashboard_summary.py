@@ -0,0 +1,92 @@
+"""Compare the consolidated dashboard summary query with the legacy six-query path.
+
+Both implementations run in-process against the same seeded database; the
+script checks they return identical payloads and reports latency and
+statement counts for each.
+
+    python -m benchmarks.bench_dashboard_summary --sales 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import and_, event, func
+
+from .common import seed_database, sqlite_url, summarize
+
+
+def legacy_dashboard_summary(db, models):
+    """The pre-consolidation implementation: one round-trip per figure."""
+    today = date.today()
+    month_start = today.replace(day=1)
+    today_sales = db.query(func.coalesce(func.sum(models.Sale.total_amount), 0)).filter(
+        models.Sale.sale_date == today).scalar()
+    today_expenses = db.query(func.coalesce(func.sum(models.Expense.amount), 0)).filter(
+        models.Expense.expense_date == today).scalar()
+    month_sales = db.query(func.coalesce(func.sum(models.Sale.total_amount), 0)).filter(
+        and_(models.Sale.sale_date >= month_start, models.Sale.sale_date <= today)).scalar()
+    month_expenses = db.query(func.coalesce(func.sum(models.Expense.amount), 0)).filter(
+        and_(models.Expense.expense_date >= month_start, models.Expense.expense_date <= today)).scalar()
+    low_stock_count = db.query(func.count(models.Product.id)).filter(
+        models.Product.current_stock <= models.Product.minimum_stock_level,
+        models.Product.is_active == True).scalar()
+    recent_sales_count = db.query(func.count(models.Sale.id)).filter(models.Sale.sale_date == today).scalar()
+    return (float(today_sales), float(today_expenses), float(month_sales), float(month_expenses),
+            low_stock_count, recent_sales_count)
+
+
+def flatten(summary):
+    metrics, alerts = summary["metrics"], summary["alerts"]
+    return (metrics["today"]["total_sales"], metrics["today"]["total_expenses"],
+            metrics["this_month"]["total_sales"], metrics["this_month"]["total_expenses"],
+            alerts["low_stock_products"], alerts["recent_sales_count"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--expenses", type=int, default=50_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_sales=args.sales, n_expenses=args.expenses)
+
+    from app.database import engine, SessionLocal
+    from app import crud, models
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a, **kw: statements.append(a[2]))
+
+    implementations = {
+        "legacy": lambda db: legacy_dashboard_summary(db, models),
+        "consolidated": lambda db: flatten(crud.get_dashboard_summary(db)),
+    }
+
+    results, outputs = {}, {}
+    for name, run in implementations.items():
+        latencies = []
+        db = SessionLocal()
+        try:
+            for _ in range(args.iterations):
+                statements.clear()
+                start = time.perf_counter()
+                outputs[name] = run(db)
+                latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+        results[name] = dict(summarize(latencies), statements=len(statements))
+
+    print(json.dumps({
+        "benchmark": "dashboard_summary",
+        "sales": args.sales,
+        "identical_results": outputs["legacy"] == outputs["consolidated"],
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measure how slow queries affect concurrent requests on one uvicorn worker.
+
+Runs the same workload with ``DB_EXECUTION_MODE=inline`` and
+``DB_EXECUTION_MODE=threadpool``: background clients hammer the product profit
+analysis while a probe measures ``/health`` and dashboard latency.
+
+    python -m benchmarks.bench_event_loop --sales 20000 --concurrency 8
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import Server, seed_database, sqlite_url, summarize, timed_request
+
+
+def run_mode(database_url: str, mode: str, concurrency: int, probes: int) -> dict:
+    with Server(database_url, env={"DB_EXECUTION_MODE": mode}) as server:
+        stop = threading.Event()
+        slow_latencies = []
+
+        def slow_client():
+            while not stop.is_set():
+                slow_latencies.append(timed_request(f"{server.base_url}/api/v1/analytics/products/profit"))
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(slow_client)
+            health = [timed_request(f"{server.base_url}/health") for _ in range(probes)]
+            dashboard = [timed_request(f"{server.base_url}/api/v1/analytics/dashboard/summary")
+                         for _ in range(probes)]
+            stop.set()
+
+    return {
+        "mode": mode,
+        "health": summarize(health),
+        "dashboard_summary": summarize(dashboard),
+        "products_profit": summarize(slow_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sales", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--probes", type=int, default=50)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    database_url = sqlite_url(db_path)
+    seed_database(database_url, n_sales=args.sales)
+
+    results = [run_mode(database_url, mode, args.concurrency, args.probes) for mode in ("inline", "threadpool")]
+    print(json.dumps({"benchmark": "event_loop", "sales": args.sales, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
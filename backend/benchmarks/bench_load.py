@@ -0,0 +1,185 @@
+"""Mixed-workload HTTP load test.
+
+Seeds a SQLite database, boots the backend and drives a weighted mix of
+dashboard, sales list, checkout and profit-analysis requests from concurrent
+clients for a fixed duration. Prints (and optionally writes) per-endpoint
+p50/p95/p99 latency, requests/second and error counts, tagged with the
+current git commit so runs can be compared with ``--compare``.
+
+    python -m benchmarks.bench_load --concurrency 16 --duration 30 --output load.json
+    python -m benchmarks.bench_load --mix dashboard=1,list_sales=1 --compare load.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from .common import BACKEND_DIR, Server, seed_database, sqlite_url, summarize, timed_request
+
+DEFAULT_MIX = "dashboard=3,list_sales=4,create_sale=2,profit=1"
+
+
+def build_requests(n_products: int):
+    """Endpoint name -> callable(rng) returning ``(path, method, body)``."""
+
+    def create_sale(rng):
+        items = [
+            {"product_id": rng.randint(1, n_products), "quantity": rng.randint(1, 3),
+             "unit_price": 800, "cost_price": 300}
+            for _ in range(rng.randint(1, 4))
+        ]
+        return "/api/v1/sales/", "POST", {
+            "sale_date": str(date.today()), "payment_method": rng.choice(["cash", "card", "mobile_money"]),
+            "items": items,
+        }
+
+    return {
+        "dashboard": lambda rng: ("/api/v1/analytics/dashboard/summary", "GET", None),
+        "list_sales": lambda rng: (f"/api/v1/sales/?limit={rng.choice([20, 50, 100])}", "GET", None),
+        "create_sale": create_sale,
+        "profit": lambda rng: ("/api/v1/analytics/products/profit", "GET", None),
+    }
+
+
+def parse_mix(mix: str, available) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in available:
+            raise SystemExit(f"Unknown endpoint '{name}' in --mix (choose from {', '.join(available)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_load(base_url: str, requests, weights: dict, concurrency: int, duration: float, seed: int):
+    names, cumulative = list(weights), []
+    total = 0.0
+    for name in names:
+        total += weights[name]
+        cumulative.append(total)
+
+    latencies = {name: [] for name in names}
+    errors = {name: {} for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        local_latencies = {name: [] for name in names}
+        local_errors = {name: {} for name in names}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, cum_weights=cumulative)[0]
+            path, method, body = requests[name](rng)
+            try:
+                local_latencies[name].append(timed_request(f"{base_url}{path}", method=method, body=body))
+            except urllib.error.HTTPError as e:
+                local_errors[name][str(e.code)] = local_errors[name].get(str(e.code), 0) + 1
+            except OSError as e:
+                key = type(e).__name__
+                local_errors[name][key] = local_errors[name].get(key, 0) + 1
+        with lock:
+            for name in names:
+                latencies[name].extend(local_latencies[name])
+                for key, count in local_errors[name].items():
+                    errors[name][key] = errors[name].get(key, 0) + count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """Relative change of throughput and tail latency against a previous run."""
+    deltas = {}
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        deltas[name] = {
+            metric: round((current[metric] - previous[metric]) / previous[metric] * 100, 1) if previous[metric] else None
+            for metric in ("requests_per_second", "p50_ms", "p95_ms", "p99_ms")
+        }
+    return {"baseline_commit": baseline.get("commit"), "percent_change": deltas}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--expenses", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted endpoints (default {DEFAULT_MIX})")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to diff against")
+    args = parser.parse_args()
+
+    requests = build_requests(args.products)
+    weights = parse_mix(args.mix, requests)
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_products=args.products, n_sales=args.sales, n_expenses=args.expenses,
+                  seed=args.seed)
+
+    with Server(database_url, workers=args.workers) as server:
+        if args.warmup > 0:
+            run_load(server.base_url, requests, weights, args.concurrency, args.warmup, args.seed)
+        latencies, errors, elapsed = run_load(server.base_url, requests, weights, args.concurrency,
+                                              args.duration, args.seed)
+
+    endpoints = {}
+    for name in weights:
+        endpoints[name] = {
+            **summarize(latencies[name]),
+            "requests_per_second": round(len(latencies[name]) / elapsed, 1),
+            "errors": errors[name],
+        }
+    completed = sum(len(values) for values in latencies.values())
+    results = {
+        "benchmark": "load",
+        "commit": git_commit(),
+        "config": {
+            "products": args.products, "sales": args.sales, "expenses": args.expenses,
+            "concurrency": args.concurrency, "duration_s": args.duration, "mix": weights,
+            "workers": args.workers, "seed": args.seed,
+        },
+        "total": {
+            **summarize([latency for values in latencies.values() for latency in values]),
+            "requests_per_second": round(completed / elapsed, 1),
+            "errors": sum(sum(counts.values()) for counts in errors.values()),
+        },
+        "endpoints": endpoints,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            results["comparison"] = compare(results, json.load(f))
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
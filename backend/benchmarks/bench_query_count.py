@@ -0,0 +1,66 @@
+"""Count SQL statements issued to load and serialize each list endpoint.
+
+The crud list functions (ORM and Core ``*_rows`` variants) are called
+in-process and their results validated through the same response schemas the
+routers use. With eager loading in
+place the statement count stays small and independent of row fan-out (selectin
+batches ids 500 at a time); the script exits non-zero if any request exceeds
+``--max-statements``.
+
+    python -m benchmarks.bench_query_count --sizes 10 100 1000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from sqlalchemy import event
+
+from .common import seed_database, sqlite_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--max-statements", type=int, default=4)
+    args = parser.parse_args()
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_sales=max(args.sizes), n_expenses=max(args.sizes), n_products=max(args.sizes))
+
+    from app.database import engine, SessionLocal
+    from app import crud, schemas
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a, **kw: statements.append(a[2]))
+
+    endpoints = {
+        "sales": (crud.get_sales, schemas.Sale),
+        "sales_rows": (crud.get_sales_rows, schemas.Sale),
+        "expenses": (crud.get_expenses, schemas.Expense),
+        "expenses_rows": (crud.get_expenses_rows, schemas.Expense),
+        "products": (crud.get_products, schemas.Product),
+    }
+
+    results, failed = {}, False
+    for name, (fetch, schema) in endpoints.items():
+        counts = {}
+        for size in args.sizes:
+            db = SessionLocal()
+            try:
+                statements.clear()
+                rows = fetch(db, limit=size)
+                [schema.model_validate(row) for row in rows]
+                counts[size] = len(statements)
+            finally:
+                db.close()
+        results[name] = counts
+        failed = failed or max(counts.values()) > args.max_statements
+
+    print(json.dumps({"benchmark": "query_count", "statements_per_request": results}, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""ORM vs Core read path for the list endpoints.
+
+For pages of sales and expenses, compares ``crud.get_sales`` / ``get_expenses``
+(ORM instances, then schema validation) with ``get_sales_rows`` /
+``get_expenses_rows`` (row mappings straight into response dicts). Reports CPU
+time and peak traced memory per 1000 rows, both for the fetch alone and for
+fetch plus JSON encoding, and checks that both paths produce identical JSON.
+
+    python -m benchmarks.bench_read_path --sales 20000 --page 1000 --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from .common import seed_database, sqlite_url
+
+
+def measure(work, repeat: int):
+    """Median CPU milliseconds over ``repeat`` runs and the peak traced memory of one run."""
+    work()  # warm up statement caches and schema adapters
+    cpu = []
+    for _ in range(repeat):
+        start = time.process_time()
+        work()
+        cpu.append((time.process_time() - start) * 1000)
+    tracemalloc.start()
+    work()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(cpu), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sales", type=int, default=20000)
+    parser.add_argument("--expenses", type=int, default=5000)
+    parser.add_argument("--page", type=int, default=1000, help="rows per request")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_products=500, n_sales=args.sales, n_expenses=args.expenses)
+
+    from app.database import SessionLocal
+    from app import crud, responses, schemas
+
+    endpoints = {
+        "sales": (crud.get_sales, crud.get_sales_rows, schemas.Sale),
+        "expenses": (crud.get_expenses, crud.get_expenses_rows, schemas.Expense),
+    }
+    results = {}
+    identical = True
+    for name, (orm_reader, core_reader, schema) in endpoints.items():
+
+        def orm_fetch():
+            db = SessionLocal()
+            try:
+                return [schema.model_validate(obj) for obj in orm_reader(db, limit=args.page)]
+            finally:
+                db.close()
+
+        def core_fetch():
+            db = SessionLocal()
+            try:
+                return core_reader(db, limit=args.page)
+            finally:
+                db.close()
+
+        def orm_render():
+            db = SessionLocal()
+            try:
+                return responses.render_list(schema, orm_reader(db, limit=args.page))
+            finally:
+                db.close()
+
+        def core_render():
+            return responses.dumps(core_fetch())
+
+        identical = identical and orm_render() == core_render()
+        per_1000 = 1000 / args.page
+        entry = {}
+        for label, work in (("orm_fetch", orm_fetch), ("core_fetch", core_fetch),
+                            ("orm_fetch_and_encode", orm_render), ("core_fetch_and_encode", core_render)):
+            cpu_ms, peak = measure(work, args.repeat)
+            entry[label] = {
+                "cpu_ms_per_1000_rows": round(cpu_ms * per_1000, 2),
+                "peak_kib_per_1000_rows": round(peak / 1024 * per_1000, 1),
+            }
+        entry["cpu_speedup"] = round(
+            entry["orm_fetch_and_encode"]["cpu_ms_per_1000_rows"] / entry["core_fetch_and_encode"]["cpu_ms_per_1000_rows"], 2
+        )
+        entry["memory_ratio"] = round(
+            entry["core_fetch_and_encode"]["peak_kib_per_1000_rows"] / entry["orm_fetch_and_encode"]["peak_kib_per_1000_rows"], 2
+        )
+        results[name] = entry
+
+    print(json.dumps({
+        "benchmark": "read_path",
+        "page_size": args.page,
+        "repeat": args.repeat,
+        "identical_json": identical,
+        "results": results,
+    }, indent=2))
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Range limits of ``GET /api/v1/analytics/trends``.
+
+Boots the backend and checks that the default window and a range at the cap
+of each granularity answer 200 with one point per period, while a range one
+period past the cap (and a century-wide ``start``) answers 400 instead of
+building and serializing tens of thousands of empty buckets. Exits non-zero
+on any unexpected status or bucket count.
+
+    python -m benchmarks.check_trends_limits
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import urllib.error
+import urllib.request
+from datetime import date, timedelta
+
+from .common import Server, seed_database, sqlite_url
+
+END = date(2024, 12, 31)
+
+
+def get(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+
+def cases(limits: dict):
+    """``(name, query, expected status, expected points or None)``."""
+    day, week, month = limits["day"], limits["week"], limits["month"]
+    # END is a Tuesday; week buckets start on Mondays
+    week_start = END - timedelta(days=END.weekday())
+    month_start = date(END.year - (month - 1) // 12, 12 - (month - 1) % 12, 1)
+    return [
+        ("default_month", "granularity=month", 200, None),
+        ("default_day", "granularity=day", 200, 30),
+        ("day_at_cap", f"granularity=day&start={END - timedelta(days=day - 1)}&end={END}", 200, day),
+        ("day_over_cap", f"granularity=day&start={END - timedelta(days=day)}&end={END}", 400, None),
+        ("week_at_cap", f"granularity=week&start={week_start - timedelta(weeks=week - 1)}&end={END}", 200, week),
+        ("week_over_cap", f"granularity=week&start={week_start - timedelta(weeks=week)}&end={END}", 400, None),
+        ("month_at_cap", f"granularity=month&start={month_start}&end={END}", 200, month),
+        ("month_over_cap", f"granularity=month&start={month_start - timedelta(days=1)}&end={END}", 400, None),
+        ("day_since_1900", "granularity=day&start=1900-01-01", 400, None),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_products=20, n_sales=50, n_expenses=10)
+
+    from app.crud import TREND_MAX_PERIODS
+
+    checks = {}
+    with Server(database_url, port=args.port) as server:
+        for name, query, expected_status, expected_points in cases(TREND_MAX_PERIODS):
+            status, body = get(f"{server.base_url}/api/v1/analytics/trends?{query}")
+            points = len(body["data"]) if body else None
+            checks[name] = {
+                "status": status,
+                "points": points,
+                "ok": status == expected_status and (expected_points is None or points == expected_points),
+            }
+
+    ok = all(check["ok"] for check in checks.values())
+    print(json.dumps({"benchmark": "trends_limits", "ok": ok, "limits": TREND_MAX_PERIODS, "checks": checks}, indent=2))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cross-session staleness check for the ETag validators and the catalog cache.
+
+Boots the backend, loads ``GET /api/v1/products/{id}`` so the server caches the
+product, then changes its stock and bumps the ``products`` version from a
+separate session (as another worker or ``datagen`` would). The next request
+must carry a new ETag *and* the new stock, and the old ETag must no longer
+produce a 304. Exits non-zero on any stale response.
+
+    python -m benchmarks.check_validators
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import urllib.error
+import urllib.request
+
+from .common import Server, seed_database, sqlite_url
+
+
+def get(url: str, headers: dict = None):
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, response.headers.get("ETag"), json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, e.headers.get("ETag"), None
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--product-id", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    database_url = sqlite_url(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    seed_database(database_url, n_products=20, n_sales=50, n_expenses=10)
+
+    from sqlalchemy import update
+    from app.database import SessionLocal
+    from app import models, versions
+
+    checks = {}
+    with Server(database_url, port=args.port) as server:
+        url = f"{server.base_url}/api/v1/products/{args.product_id}"
+        _, old_etag, before = get(url)
+        get(url)  # served from the server's catalog cache
+
+        new_stock = before["current_stock"] + 7
+        db = SessionLocal()
+        try:
+            db.execute(update(models.Product).where(models.Product.id == args.product_id)
+                       .values(current_stock=new_stock))
+            versions.bump(db, "products")
+            db.commit()
+        finally:
+            db.close()
+
+        status, new_etag, after = get(url)
+        conditional_status, _, conditional_body = get(url, {"If-None-Match": old_etag})
+        checks = {
+            "etag_changed": new_etag != old_etag,
+            "detail_fresh": status == 200 and after["current_stock"] == new_stock,
+            "old_etag_revalidates": conditional_status == 200
+            and conditional_body["current_stock"] == new_stock,
+        }
+
+    ok = all(checks.values())
+    print(json.dumps({"benchmark": "validators", "ok": ok, "checks": checks}, indent=2))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
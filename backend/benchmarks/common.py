@@ -0,0 +1,155 @@
+"""Shared helpers for the SmartTrack backend benchmarks.
+
+Benchmarks boot ``app.main:app`` under uvicorn against a local SQLite file so
+they can run without the Docker MySQL service.
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import date, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def sqlite_url(path: str) -> str:
+    return f"sqlite:///{path}"
+
+
+def seed_database(database_url: str, n_products: int = 200, n_sales: int = 5000,
+                  n_expenses: int = 1000, seed: int = 42):
+    """Create the schema and fill it with a reproducible data set."""
+    os.environ["DATABASE_URL"] = database_url
+    sys.path.insert(0, str(BACKEND_DIR))
+    from sqlalchemy import insert
+    from app.database import engine, Base
+    from app import models
+
+    rng = random.Random(seed)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.Category), [
+            {"id": 1, "name": "Groceries", "category_type": "product"},
+            {"id": 2, "name": "Beverages", "category_type": "product"},
+            {"id": 3, "name": "Utilities", "category_type": "expense"},
+            {"id": 4, "name": "Rent", "category_type": "expense"},
+        ])
+        conn.execute(insert(models.Product), [
+            {
+                "id": i,
+                "name": f"Product {i}",
+                "category_id": rng.choice([1, 2]),
+                "cost_price": round(rng.uniform(50, 500), 2),
+                "selling_price": round(rng.uniform(600, 1000), 2),
+                "current_stock": 1_000_000,
+                "minimum_stock_level": 10,
+                "is_active": True,
+            }
+            for i in range(1, n_products + 1)
+        ])
+
+        today = date.today()
+        for chunk_start in range(1, n_sales + 1, 10000):
+            sales, items = [], []
+            for sale_id in range(chunk_start, min(chunk_start + 10000, n_sales + 1)):
+                basket = [(rng.randint(1, n_products), rng.randint(1, 5)) for _ in range(rng.randint(1, 4))]
+                total = 0
+                for product_id, quantity in basket:
+                    unit_price = 800
+                    total += unit_price * quantity
+                    items.append({"sale_id": sale_id, "product_id": product_id, "quantity": quantity,
+                                  "unit_price": unit_price, "total_price": unit_price * quantity,
+                                  "cost_price": 300})
+                sales.append({"id": sale_id, "sale_date": today - timedelta(days=rng.randint(0, 365)),
+                              "total_amount": total,
+                              "payment_method": rng.choice(["cash", "card", "mobile_money"])})
+            conn.execute(insert(models.Sale), sales)
+            conn.execute(insert(models.SaleItem), items)
+        conn.execute(insert(models.Expense), [
+            {"description": f"Expense {i}", "amount": round(rng.uniform(1000, 50000), 2),
+             "category_id": rng.choice([3, 4]), "expense_date": today - timedelta(days=rng.randint(0, 365)),
+             "payment_method": "bank_transfer"}
+            for i in range(1, n_expenses + 1)
+        ])
+
+    from app.database import SessionLocal
+    from app import rollups
+    db = SessionLocal()
+    try:
+        rollups.rebuild(db)
+    finally:
+        db.close()
+    engine.dispose()
+
+
+class Server:
+    """Run uvicorn in a subprocess for the duration of a ``with`` block."""
+
+    def __init__(self, database_url: str, port: int = 8765, env: dict = None, workers: int = 1):
+        self.port = port
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.env = dict(os.environ, DATABASE_URL=database_url,
+                        LOG_DIR=os.path.join(tempfile.gettempdir(), "smarttrack-bench-logs"), **(env or {}))
+        self.workers = workers
+        self.process = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=self.env,
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                get_json(f"{self.base_url}/health")
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError("Backend did not become healthy within 30 seconds")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait(timeout=10)
+
+
+def get_json(url: str, timeout: float = 60):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def timed_request(url: str, method: str = "GET", body: dict = None, timeout: float = 60) -> float:
+    """Issue a request and return its latency in milliseconds."""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(latencies_ms) -> dict:
+    return {
+        "count": len(latencies_ms),
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms), 2) if latencies_ms else 0.0,
+    }
@@ -0,0 +1,272 @@
+"""Deterministic large-scale synthetic data generator.
+
+Fills the database with products across the standard categories, sales with
+realistic basket sizes, weekly and yearly seasonality and a payment-method
+mix, and matching expenses (rent, salaries, utilities, restocking, marketing).
+The same ``--seed`` and ``--end-date`` always produce the same rows.
+
+Rows are built in memory one chunk at a time and written with executemany
+inserts on the Core tables (PyMySQL rewrites these into multi-row
+``INSERT ... VALUES`` statements), then the daily rollups are rebuilt.
+
+    python -m benchmarks.datagen --products 2000 --sales 2000000 --reset
+    DATABASE_URL=sqlite:////tmp/big.db python -m benchmarks.datagen --sales 500000 --reset
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from .common import BACKEND_DIR
+
+# (name, description, cost price range) per product category, as in database/sample_data.sql
+PRODUCT_CATEGORIES = [
+    ("Fresh Produce", "Fresh fruits and vegetables", (80, 400)),
+    ("Dairy & Eggs", "Milk, cheese, yogurt, and eggs", (200, 900)),
+    ("Beverages", "Soft drinks, juices, and water", (50, 600)),
+    ("Snacks & Confectionery", "Chips, chocolates, and candies", (100, 700)),
+    ("Household Essentials", "Cleaning supplies and toiletries", (200, 2500)),
+]
+EXPENSE_CATEGORIES = [
+    ("Inventory Purchase", "Cost of goods purchased for resale"),
+    ("Staff Salaries", "Employee wages and benefits"),
+    ("Utilities", "Electricity, water, internet bills"),
+    ("Rent & Property", "Store rent and property expenses"),
+    ("Marketing & Advertising", "Promotional and advertising costs"),
+]
+UNITS = ["piece", "kg", "liter", "pack", "bottle", "dozen", "bar", "tube", "cup"]
+
+PAYMENT_METHODS = ["cash", "card", "mobile_money", "bank_transfer"]
+PAYMENT_WEIGHTS = [45, 30, 20, 5]
+
+# Items per basket: mostly small baskets with a long tail (mean about 3.4)
+BASKET_SIZES = list(range(1, 16))
+BASKET_WEIGHTS = [22, 20, 16, 12, 9, 7, 5, 3, 2, 1.5, 1, 0.7, 0.4, 0.25, 0.15]
+QUANTITIES = [1, 2, 3, 4, 5, 6]
+QUANTITY_WEIGHTS = [60, 22, 9, 5, 3, 1]
+
+# Relative sales volume by weekday (Monday first) and month
+WEEKDAY_FACTORS = [0.85, 0.85, 0.9, 0.95, 1.15, 1.4, 1.1]
+MONTH_FACTORS = [0.85, 0.85, 0.95, 1.0, 1.0, 0.95, 0.95, 1.0, 1.0, 1.05, 1.1, 1.45]
+
+DISCOUNT_RATE = 0.08
+TAX_RATE = 0.075
+
+
+def day_weights(start: date, days: int):
+    """Seasonal share of sales for each day, including slow year-on-year growth."""
+    weights = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        growth = 1 + 0.15 * offset / 365
+        weights.append(WEEKDAY_FACTORS[day.weekday()] * MONTH_FACTORS[day.month - 1] * growth)
+    return weights
+
+
+def allocate(total: int, weights, rng: random.Random):
+    """Split ``total`` into integer counts proportional to ``weights`` (largest remainder)."""
+    scale = total / sum(weights)
+    exact = [weight * scale for weight in weights]
+    counts = [math.floor(value) for value in exact]
+    remainders = sorted(range(len(weights)), key=lambda i: (exact[i] - counts[i], rng.random()), reverse=True)
+    for i in remainders[:total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def generate_products(rng: random.Random, n_products: int):
+    products = []
+    for product_id in range(1, n_products + 1):
+        category_index = rng.randrange(len(PRODUCT_CATEGORIES))
+        category_name, _, (low, high) = PRODUCT_CATEGORIES[category_index]
+        cost = round(rng.uniform(low, high), 2)
+        products.append({
+            "id": product_id,
+            "name": f"{category_name.split()[0]} Item {product_id:06d}",
+            "description": f"Synthetic {category_name.lower()} product",
+            "category_id": category_index + 1,
+            "unit_of_measure": rng.choice(UNITS),
+            "cost_price": cost,
+            "selling_price": round(cost * rng.uniform(1.15, 1.45), 2),
+            "current_stock": rng.randint(0, 500),
+            "minimum_stock_level": rng.choice([5, 10, 15, 20, 25]),
+            "is_active": rng.random() > 0.02,
+        })
+    return products
+
+
+def generate_sales(rng: random.Random, products, n_sales: int, start: date, days: int, chunk_size: int):
+    """Yield ``(sales, items)`` chunks; ids are assigned here so items can reference their sale."""
+    # Zipf-like popularity: a few products account for most of the volume
+    popularity = [1 / (rank ** 0.9) for rank in range(1, len(products) + 1)]
+    rng.shuffle(popularity)
+    cumulative, running = [], 0.0
+    for weight in popularity:
+        running += weight
+        cumulative.append(running)
+    prices = [(p["selling_price"], p["cost_price"]) for p in products]
+    product_indexes = range(len(products))
+
+    sales, items = [], []
+    sale_id = item_id = 0
+    for offset, count in enumerate(allocate(n_sales, day_weights(start, days), rng)):
+        sale_date = start + timedelta(days=offset)
+        for _ in range(count):
+            sale_id += 1
+            basket_size = rng.choices(BASKET_SIZES, BASKET_WEIGHTS)[0]
+            chosen = set(rng.choices(product_indexes, cum_weights=cumulative, k=basket_size))
+            subtotal_cents = 0
+            for index in chosen:
+                item_id += 1
+                quantity = rng.choices(QUANTITIES, QUANTITY_WEIGHTS)[0]
+                unit_price, cost_price = prices[index]
+                line_cents = round(unit_price * 100) * quantity
+                subtotal_cents += line_cents
+                items.append({
+                    "id": item_id, "sale_id": sale_id, "product_id": index + 1, "quantity": quantity,
+                    "unit_price": unit_price, "total_price": line_cents / 100, "cost_price": cost_price,
+                })
+            discount_cents = round(subtotal_cents * 0.05) if rng.random() < DISCOUNT_RATE else 0
+            tax_cents = round((subtotal_cents - discount_cents) * TAX_RATE)
+            sales.append({
+                "id": sale_id,
+                "sale_date": sale_date,
+                "total_amount": (subtotal_cents - discount_cents + tax_cents) / 100,
+                "discount_amount": discount_cents / 100,
+                "tax_amount": tax_cents / 100,
+                "payment_method": rng.choices(PAYMENT_METHODS, PAYMENT_WEIGHTS)[0],
+                "customer_name": f"Customer {rng.randint(1, 50000)}" if rng.random() < 0.3 else None,
+            })
+            if len(sales) >= chunk_size:
+                yield sales, items
+                sales, items = [], []
+    if sales:
+        yield sales, items
+
+
+def generate_expenses(rng: random.Random, start: date, days: int, daily_revenue):
+    """Monthly fixed costs plus weekly restocking sized to the week's revenue and ad-hoc marketing."""
+    expenses = []
+    category_ids = {name: len(PRODUCT_CATEGORIES) + i + 1 for i, (name, _) in enumerate(EXPENSE_CATEGORIES)}
+    rent = round(rng.uniform(100_000, 300_000), -3)
+    payroll = round(rng.uniform(200_000, 600_000), -3)
+
+    def add(day, description, amount, category, method, vendor):
+        expenses.append({
+            "id": len(expenses) + 1, "description": description, "amount": round(amount, 2),
+            "category_id": category_ids[category], "expense_date": day, "payment_method": method,
+            "vendor_name": vendor, "receipt_number": f"{category[:3].upper()}-{len(expenses) + 1:08d}",
+        })
+
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if day.day == 1:
+            add(day, "Monthly store rent", rent, "Rent & Property", "bank_transfer", "City Properties Ltd")
+            add(day, "Electricity bill", rng.uniform(20_000, 60_000), "Utilities", "bank_transfer", "Power Distribution Co")
+            add(day, "Water and internet", rng.uniform(8_000, 20_000), "Utilities", "card", "Metro Services")
+        if day.day == 28:
+            add(day, "Staff salaries", payroll * rng.uniform(0.97, 1.05), "Staff Salaries", "bank_transfer", None)
+        if day.weekday() == 0:
+            week_revenue = sum(daily_revenue[offset:offset + 7])
+            add(day, "Weekly stock replenishment", max(week_revenue * rng.uniform(0.55, 0.7), 1000),
+                "Inventory Purchase", rng.choice(["bank_transfer", "check"]), "Wholesale Distributors")
+        if rng.random() < 0.05:
+            add(day, "Promotional campaign", rng.uniform(5_000, 40_000), "Marketing & Advertising",
+                rng.choice(["card", "cash"]), "Local Media")
+    return expenses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="defaults to $DATABASE_URL (or the application default)")
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=730, help="history length ending at --end-date")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(),
+                        help="last day of history (fix it for byte-identical data across days)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=20_000, help="sales per insert batch")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    sys.path.insert(0, str(BACKEND_DIR))
+    from sqlalchemy import func, insert, select, text
+    from app.database import Base, SessionLocal, engine
+    from app import models, rollups
+
+    started = time.perf_counter()
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        if conn.scalar(select(func.count()).select_from(models.Sale)) or \
+                conn.scalar(select(func.count()).select_from(models.Product)):
+            raise SystemExit("Database already has products or sales; rerun with --reset to replace them")
+
+    rng = random.Random(args.seed)
+    start = args.end_date - timedelta(days=args.days - 1)
+    counts = {"products": args.products, "sales": 0, "sale_items": 0, "expenses": 0}
+    daily_revenue = [0.0] * args.days
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "mysql":
+            conn.execute(text("SET unique_checks = 0"))
+            conn.execute(text("SET foreign_key_checks = 0"))
+        elif engine.dialect.name == "sqlite":
+            conn.execute(text("PRAGMA synchronous = OFF"))
+
+        # Session settings outlive the transaction on a pooled connection, so
+        # restore them even when an insert fails
+        try:
+            conn.execute(insert(models.Category.__table__), [
+                {"id": i + 1, "name": name, "description": description, "category_type": "product"}
+                for i, (name, description, _) in enumerate(PRODUCT_CATEGORIES)
+            ] + [
+                {"id": len(PRODUCT_CATEGORIES) + i + 1, "name": name, "description": description,
+                 "category_type": "expense"}
+                for i, (name, description) in enumerate(EXPENSE_CATEGORIES)
+            ])
+            products = generate_products(rng, args.products)
+            conn.execute(insert(models.Product.__table__), products)
+
+            for sales, items in generate_sales(rng, products, args.sales, start, args.days, args.chunk_size):
+                conn.execute(insert(models.Sale.__table__), sales)
+                conn.execute(insert(models.SaleItem.__table__), items)
+                for sale in sales:
+                    daily_revenue[(sale["sale_date"] - start).days] += sale["total_amount"]
+                counts["sales"] += len(sales)
+                counts["sale_items"] += len(items)
+                print(f"  {counts['sales']:,} / {args.sales:,} sales", file=sys.stderr)
+
+            expenses = generate_expenses(rng, start, args.days, daily_revenue)
+            conn.execute(insert(models.Expense.__table__), expenses)
+            counts["expenses"] = len(expenses)
+        finally:
+            if engine.dialect.name == "mysql":
+                conn.execute(text("SET unique_checks = 1"))
+                conn.execute(text("SET foreign_key_checks = 1"))
+
+    db = SessionLocal()
+    try:
+        rollups.rebuild(db)
+    finally:
+        db.close()
+
+    print(json.dumps({
+        "seed": args.seed,
+        "start_date": str(start),
+        "end_date": str(args.end_date),
+        "rows": counts,
+        "seconds": round(time.perf_counter() - started, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
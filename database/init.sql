@@ -48,6 +48,7 @@ CREATE TABLE expenses (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE SET NULL,
     INDEX idx_expense_date (expense_date),
+    INDEX idx_expense_date_id (expense_date, id),
     INDEX idx_expense_amount (amount)
 );
 
@@ -64,6 +65,7 @@ CREATE TABLE sales (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_sale_date (sale_date),
+    INDEX idx_sale_date_id (sale_date, id),
     INDEX idx_sale_amount (total_amount)
 );
 
@@ -83,6 +85,51 @@ CREATE TABLE sale_items (
     INDEX idx_sale_items_product (product_id)
 );
 
+-- Daily rollups maintained alongside sales and expenses (see backend/app/rollups.py)
+CREATE TABLE sales_daily_rollup (
+    sale_date DATE NOT NULL,
+    payment_method ENUM('cash', 'card', 'bank_transfer', 'mobile_money') NOT NULL,
+    sale_count INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    discount_amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    tax_amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (sale_date, payment_method)
+);
+
+CREATE TABLE product_sales_daily_rollup (
+    sale_date DATE NOT NULL,
+    product_id INT NOT NULL,
+    quantity_sold INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    total_cost DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (sale_date, product_id),
+    INDEX idx_product_sales_daily_rollup_product (product_id)
+);
+
+CREATE TABLE expense_daily_rollup (
+    expense_date DATE NOT NULL,
+    category_id INT NOT NULL DEFAULT 0,
+    expense_count INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (expense_date, category_id)
+);
+
+-- Lifetime per-product sales totals, updated with product_sales_daily_rollup
+CREATE TABLE product_sales_totals (
+    product_id INT NOT NULL PRIMARY KEY,
+    quantity_sold INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(16, 2) NOT NULL DEFAULT 0.00,
+    total_cost DECIMAL(16, 2) NOT NULL DEFAULT 0.00
+);
+
+-- Per-table write counters; the backend bumps them with every write and derives
+-- ETag / Last-Modified validators from them
+CREATE TABLE table_versions (
+    table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL
+);
+
 -- Analytics view for product profitability
 CREATE VIEW product_profit_view AS
 SELECT
@@ -98,17 +145,5 @@ LEFT JOIN categories c ON p.category_id = c.id
 LEFT JOIN sale_items si ON p.id = si.product_id
 GROUP BY p.id, p.name, c.name;
 
--- Triggers for automatic stock management
-DELIMITER //
-
-CREATE TRIGGER update_stock_on_sale
-AFTER INSERT ON sale_items
-FOR EACH ROW
-BEGIN
-    UPDATE products
-    SET current_stock = current_stock - NEW.quantity,
-        updated_at = CURRENT_TIMESTAMP
-    WHERE id = NEW.product_id;
-END//
-
-DELIMITER ;
\ No newline at end of file
+-- Stock is decremented by the backend (crud.create_sale) in the same transaction
+-- as the sale, so there is deliberately no stock trigger on sale_items.
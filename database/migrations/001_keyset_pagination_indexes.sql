@@ -0,0 +1,6 @@
+-- Composite indexes backing keyset (cursor) pagination of sales and expenses history.
+-- Apply to databases created before these indexes were added to init.sql.
+USE smarttrack_db;
+
+CREATE INDEX idx_sale_date_id ON sales (sale_date, id);
+CREATE INDEX idx_expense_date_id ON expenses (expense_date, id);
@@ -0,0 +1,32 @@
+-- Daily rollup tables for sales and expenses.
+-- After applying, populate them with: python -m app.rollups rebuild
+-- (the backend also rebuilds automatically on startup when they are empty).
+USE smarttrack_db;
+
+CREATE TABLE IF NOT EXISTS sales_daily_rollup (
+    sale_date DATE NOT NULL,
+    payment_method ENUM('cash', 'card', 'bank_transfer', 'mobile_money') NOT NULL,
+    sale_count INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    discount_amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    tax_amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (sale_date, payment_method)
+);
+
+CREATE TABLE IF NOT EXISTS product_sales_daily_rollup (
+    sale_date DATE NOT NULL,
+    product_id INT NOT NULL,
+    quantity_sold INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    total_cost DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (sale_date, product_id),
+    INDEX idx_product_sales_daily_rollup_product (product_id)
+);
+
+CREATE TABLE IF NOT EXISTS expense_daily_rollup (
+    expense_date DATE NOT NULL,
+    category_id INT NOT NULL DEFAULT 0,
+    expense_count INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (expense_date, category_id)
+);
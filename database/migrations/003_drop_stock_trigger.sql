@@ -0,0 +1,5 @@
+-- The backend now reserves stock itself with a locked, conditional UPDATE in the
+-- same transaction as the sale. This trigger decremented stock a second time.
+USE smarttrack_db;
+
+DROP TRIGGER IF EXISTS update_stock_on_sale;
@@ -0,0 +1,11 @@
+-- Lifetime per-product sales totals backing /api/v1/analytics/products/profit.
+-- The backend fills the table from product_sales_daily_rollup on startup when it
+-- is empty; python -m app.rollups rebuild recomputes it as well.
+USE smarttrack_db;
+
+CREATE TABLE IF NOT EXISTS product_sales_totals (
+    product_id INT NOT NULL PRIMARY KEY,
+    quantity_sold INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(16, 2) NOT NULL DEFAULT 0.00,
+    total_cost DECIMAL(16, 2) NOT NULL DEFAULT 0.00
+);
@@ -0,0 +1,10 @@
+-- Per-table write counters backing the ETag / Last-Modified validators on GET
+-- endpoints. Rows are created by the backend on the first write to each table;
+-- a missing row reads as version 0.
+USE smarttrack_db;
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL
+);
@@ -1,15 +1,24 @@
 # frontend/app.py
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import date, datetime, timedelta
 import logging
+import os
+import threading
+import time
 from utils.api_client import APIClient
 from utils.helpers import format_currency, calculate_profit_margin
 
 logger = logging.getLogger(__name__)
 
+# Loader results are cached per argument set; writes made from this app clear
+# the affected resources, the TTL bounds staleness from other clients.
+DATA_CACHE_TTL = int(os.getenv("DATA_CACHE_TTL", "60"))
+DATA_CACHE_MAX_ENTRIES = int(os.getenv("DATA_CACHE_MAX_ENTRIES", "64"))
+
 # Configure page
 st.set_page_config(
     page_title="SmartTrack Business Analytics",
@@ -106,6 +115,14 @@ st.markdown("""
 
 
 @st.cache_resource
+def get_shared_api_client():
+    """One client per process; its health probe runs for the lifetime of the app."""
+    client = APIClient()
+    client.probe()
+    client.start_health_probe()
+    return client
+
+
 def get_api_client():
     """
     Environment-aware API client.
@@ -117,15 +134,16 @@ def get_api_client():
     Streamlit Cloud / no Docker:
       BACKEND_URL is not available, health check fails safely, and the app uses
       demo portfolio data instead of crashing.
+
+    Returns None (demo mode) only while the client's circuit is open; the
+    background health probe closes it again once the backend recovers.
     """
     try:
-        client = APIClient()
-        if client.health_check():
-            return client
-        return None
+        client = get_shared_api_client()
     except Exception as e:
         logger.warning(f"Backend unavailable, switching to demo mode: {e}")
         return None
+    return client if client.available else None
 
 
 def main():
@@ -145,6 +163,7 @@ def main():
         index=0
     )
 
+    start = time.perf_counter()
     if page == "📊 Dashboard":
         show_dashboard()
     elif page == "💰 Sales Management":
@@ -155,6 +174,7 @@ def main():
         show_product_management()
     elif page == "📈 Analytics & Reports":
         show_analytics_reports()
+    logger.info(f"Rendered {page} in {(time.perf_counter() - start) * 1000:.0f}ms")
 
     show_footer()
 
@@ -235,10 +255,87 @@ def demo_categories():
     ]
 
 
+def demo_trends():
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
+    sales = [1200000, 1350000, 1500000, 1420000, 1680000, 1850000]
+    expenses = [750000, 820000, 900000, 870000, 940000, 970000]
+    return {
+        "granularity": "month",
+        "data": [
+            {"period": m, "sales": s, "expenses": e, "profit": s - e}
+            for m, s, e in zip(months, sales, expenses)
+        ],
+    }
+
+
+# Sales tables and charts only use scalar columns, so list calls ask for
+# view="summary" (no nested sale items); expense tables name their columns.
+EXPENSE_TABLE_FIELDS = ["expense_date", "description", "amount", "vendor_name"]
+
+
+class FetchFailed(Exception):
+    """Raised inside cached fetchers so a failed call is not cached (st.cache_data skips exceptions)."""
+
+
+def _checked(data):
+    if data is None:
+        raise FetchFailed("API returned no data")
+    return data
+
+
+# One cached fetcher per resource so a write only clears what it made stale.
+# The leading underscore keeps the client out of the cache key.
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_sales(_api_client, **kwargs):
+    return _checked(_api_client.get_sales(**kwargs))
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_expenses(_api_client, **kwargs):
+    return _checked(_api_client.get_expenses(**kwargs))
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_products(_api_client, **kwargs):
+    return _checked(_api_client.get_products(**kwargs))
+
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_categories(_api_client, **kwargs):
+    return _checked(_api_client.get_categories(**kwargs))
+
+
+DATA_CACHES = {
+    "sales": fetch_sales,
+    "expenses": fetch_expenses,
+    "products": fetch_products,
+    "categories": fetch_categories,
+}
+
+# Cached resources each write makes stale; a sale also changes product stock
+WRITE_INVALIDATES = {
+    "create_sale": ("sales", "products"),
+    "create_expense": ("expenses",),
+}
+
+
+def invalidate_data_cache(*resources):
+    for resource in resources:
+        DATA_CACHES[resource].clear()
+
+
+def submit_write(api_client, method, payload):
+    """Call a create_* endpoint and clear the cached data it changed when it succeeds."""
+    result = getattr(api_client, method)(payload)
+    if result:
+        invalidate_data_cache(*WRITE_INVALIDATES[method])
+    return result
+
+
 def get_sales_data(api_client, **kwargs):
     if api_client:
         try:
-            data = api_client.get_sales(**kwargs)
+            data = fetch_sales(api_client, **kwargs)
             if data:
                 return data
         except Exception as e:
@@ -249,7 +346,7 @@ def get_sales_data(api_client, **kwargs):
 def get_expenses_data(api_client, **kwargs):
     if api_client:
         try:
-            data = api_client.get_expenses(**kwargs)
+            data = fetch_expenses(api_client, **kwargs)
             if data:
                 return data
         except Exception as e:
@@ -260,7 +357,7 @@ def get_expenses_data(api_client, **kwargs):
 def get_products_data(api_client):
     if api_client:
         try:
-            data = api_client.get_products()
+            data = fetch_products(api_client)
             if data:
                 return data
         except Exception as e:
@@ -271,7 +368,7 @@ def get_products_data(api_client):
 def get_categories_data(api_client):
     if api_client:
         try:
-            data = api_client.get_categories(category_type="expense")
+            data = fetch_categories(api_client, category_type="expense")
             if isinstance(data, list):
                 return data
         except Exception as e:
@@ -279,7 +376,62 @@ def get_categories_data(api_client):
     return demo_categories()
 
 
-def render_dashboard_from_data(dashboard_data, demo_mode=False):
+def load_page_data(api_client, page, **loaders):
+    """Run a page's independent loaders in parallel on the API client's pool.
+
+    Loaders are zero-argument callables; in demo mode they run inline. The
+    cached ``fetch_*`` functions need the session's script context, so each
+    loader attaches it to the pool thread it lands on before running (the
+    threads are shared, so it is set again on every call).
+    """
+    if api_client is None:
+        return {name: loader() for name, loader in loaders.items()}
+    ctx = get_script_run_ctx()
+
+    def in_session(loader):
+        def run():
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return loader()
+        return run
+
+    return api_client.fetch_concurrently({name: in_session(loader) for name, loader in loaders.items()},
+                                         label=page)
+
+
+def get_trends_data(api_client, **kwargs):
+    if api_client:
+        try:
+            data = api_client.get_trends(**kwargs)
+            if data and data.get("data"):
+                return data
+        except Exception as e:
+            logger.warning(f"Trends API fallback: {e}")
+    return demo_trends()
+
+
+def trends_dataframe(trends):
+    trend_df = pd.DataFrame(trends.get("data", []), columns=["period", "sales", "expenses", "profit"])
+    ensure_numeric_df(trend_df, ["sales", "expenses", "profit"])
+    return trend_df.rename(columns={
+        "period": "Period",
+        "sales": "Sales",
+        "expenses": "Expenses",
+        "profit": "Profit",
+    })
+
+
+def render_trend_chart(trend_df, title="SmartTrack Monthly Business Performance"):
+    fig = px.line(
+        trend_df,
+        x="Period",
+        y=["Sales", "Expenses", "Profit"],
+        markers=True,
+        title=title
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_dashboard_from_data(dashboard_data, demo_mode=False, trends=None):
     if demo_mode:
         st.info("Portfolio demo mode: showing sample SmartTrack business analytics data.")
 
@@ -434,43 +586,32 @@ def render_dashboard_from_data(dashboard_data, demo_mode=False):
 
     st.subheader("📈 Monthly Trend")
 
-    trend_df = pd.DataFrame({
-        "Month": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-        "Sales": [1200000, 1350000, 1500000, 1420000, 1680000, 1850000],
-        "Expenses": [750000, 820000, 900000, 870000, 940000, 970000],
-    })
-    trend_df["Profit"] = trend_df["Sales"] - trend_df["Expenses"]
-
-    fig = px.line(
-        trend_df,
-        x="Month",
-        y=["Sales", "Expenses", "Profit"],
-        markers=True,
-        title="SmartTrack Monthly Business Performance"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    render_trend_chart(trends_dataframe(trends or demo_trends()))
 
 
 def show_dashboard():
     st.header("📊 Business Dashboard")
 
     api_client = get_api_client()
-    demo_mode = api_client is None
 
-    if api_client:
-        try:
-            dashboard_data = api_client.get_dashboard_summary()
-            if not dashboard_data:
-                dashboard_data = demo_dashboard_data()
-                demo_mode = True
-        except Exception as e:
-            logger.warning(f"Dashboard API fallback: {e}")
-            dashboard_data = demo_dashboard_data()
-            demo_mode = True
-    else:
+    # Summary, trends and both recent-activity tables are independent requests
+    data = load_page_data(
+        api_client, "dashboard",
+        summary=lambda: api_client.get_dashboard_summary() if api_client else None,
+        trends=lambda: get_trends_data(api_client, granularity="month"),
+        recent_sales=lambda: get_sales_data(api_client, limit=5, view="summary"),
+        recent_expenses=lambda: get_expenses_data(api_client, limit=5, fields=EXPENSE_TABLE_FIELDS),
+    )
+
+    dashboard_data = data["summary"]
+    demo_mode = not dashboard_data
+    if demo_mode:
+        if api_client:
+            logger.warning("Dashboard API fallback: no summary returned")
         dashboard_data = demo_dashboard_data()
 
-    render_dashboard_from_data(dashboard_data, demo_mode=demo_mode)
+    trends = demo_trends() if demo_mode else data["trends"] or demo_trends()
+    render_dashboard_from_data(dashboard_data, demo_mode=demo_mode, trends=trends)
 
     st.subheader("⚡ Quick Actions")
 
@@ -501,7 +642,7 @@ def show_dashboard():
     tab1, tab2 = st.tabs(["Recent Sales", "Recent Expenses"])
 
     with tab1:
-        recent_sales_data = get_sales_data(api_client, limit=5)
+        recent_sales_data = data["recent_sales"] or demo_sales()
         sales_df = pd.DataFrame(recent_sales_data)
         ensure_numeric_df(sales_df, ["total_amount", "discount_amount"])
 
@@ -523,7 +664,7 @@ def show_dashboard():
         )
 
     with tab2:
-        recent_expenses_data = get_expenses_data(api_client, limit=5)
+        recent_expenses_data = data["recent_expenses"] or demo_expenses()
         expenses_df = pd.DataFrame(recent_expenses_data)
         ensure_numeric_df(expenses_df, ["amount"])
 
@@ -548,6 +689,16 @@ def show_dashboard():
 def show_sales_management():
     st.header("💰 Sales Management")
 
+    # The sale form and analytics tab render in the same run; fetch both in
+    # parallel so their loaders below are served from the data cache.
+    api_client = get_api_client()
+    if api_client:
+        load_page_data(
+            api_client, "sales_management",
+            products=lambda: get_products_data(api_client),
+            sales=lambda: get_sales_data(api_client, limit=100, view="summary"),
+        )
+
     tab1, tab2, tab3 = st.tabs(["📝 Record Sale", "📋 Sales History", "📊 Sales Analytics"])
 
     with tab1:
@@ -716,7 +867,7 @@ def show_record_sale_form():
                         ]
                     }
 
-                    result = api_client.create_sale(sale_data)
+                    result = submit_write(api_client, "create_sale", sale_data)
                     if result:
                         st.success("🎉 Sale recorded successfully!")
                         st.balloons()
@@ -746,7 +897,7 @@ def show_sales_history():
 
     if st.button("📊 Load Sales History", type="primary"):
         api_client = get_api_client()
-        sales = get_sales_data(api_client, start_date=start_date, end_date=end_date, limit=limit)
+        sales = get_sales_data(api_client, start_date=start_date, end_date=end_date, limit=limit, view="summary")
 
         sales_df = pd.DataFrame(sales)
         ensure_numeric_df(sales_df, ["total_amount", "discount_amount"])
@@ -791,7 +942,7 @@ def show_sales_analytics():
     st.subheader("📊 Sales Analytics")
 
     api_client = get_api_client()
-    sales = get_sales_data(api_client, limit=100)
+    sales = get_sales_data(api_client, limit=100, view="summary")
     sales_df = pd.DataFrame(sales)
     ensure_numeric_df(sales_df, ["total_amount"])
 
@@ -885,7 +1036,7 @@ def show_record_expense_form():
                         'notes': notes or None
                     }
 
-                    result = api_client.create_expense(expense_data)
+                    result = submit_write(api_client, "create_expense", expense_data)
                     if result:
                         st.success("✅ Expense recorded successfully!")
                         st.balloons()
@@ -909,7 +1060,8 @@ def show_expense_history():
 
     if st.button("📊 Load Expense History", type="primary"):
         api_client = get_api_client()
-        expenses = get_expenses_data(api_client, start_date=start_date, end_date=end_date, limit=limit)
+        expenses = get_expenses_data(api_client, start_date=start_date, end_date=end_date, limit=limit,
+                                     fields=EXPENSE_TABLE_FIELDS)
 
         expenses_df = pd.DataFrame(expenses)
         ensure_numeric_df(expenses_df, ["amount"])
@@ -958,22 +1110,28 @@ def show_product_management():
 def show_analytics_reports():
     st.header("📈 Analytics & Reports")
 
-    trend_df = pd.DataFrame({
-        "Month": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-        "Sales": [1200000, 1350000, 1500000, 1420000, 1680000, 1850000],
-        "Expenses": [750000, 820000, 900000, 870000, 940000, 970000],
-    })
+    api_client = get_api_client()
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        granularity = st.selectbox(
+            "🗓️ Granularity",
+            ["month", "week", "day"],
+            format_func=lambda x: {"day": "Daily", "week": "Weekly", "month": "Monthly"}[x]
+        )
+    with col2:
+        start_date = st.date_input("📅 From Date", value=date.today() - timedelta(days=180))
+    with col3:
+        end_date = st.date_input("📅 To Date", value=date.today())
 
-    trend_df["Profit"] = trend_df["Sales"] - trend_df["Expenses"]
+    if api_client is None:
+        st.info("Portfolio demo mode: showing sample trend data.")
 
-    fig = px.line(
-        trend_df,
-        x="Month",
-        y=["Sales", "Expenses", "Profit"],
-        markers=True,
-        title="SmartTrack Monthly Business Performance"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    trends = get_trends_data(api_client, granularity=granularity, start_date=start_date, end_date=end_date)
+    trend_df = trends_dataframe(trends)
+
+    title = {"day": "Daily", "week": "Weekly", "month": "Monthly"}.get(trends.get("granularity"), "Monthly")
+    render_trend_chart(trend_df, title=f"SmartTrack {title} Business Performance")
 
     st.dataframe(trend_df, use_container_width=True)
 
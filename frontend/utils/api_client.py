@@ -1,11 +1,163 @@
 import requests
+import json
 import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.utils import DEFAULT_ACCEPT_ENCODING
 from datetime import date
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
 import os
 
 logger = logging.getLogger(__name__)
 
+# Number of GET responses whose ETag / Last-Modified validators (and bodies) are kept; 0 disables
+VALIDATOR_CACHE_SIZE = int(os.getenv("API_VALIDATOR_CACHE_SIZE", "256"))
+# Threads available to fetch_concurrently; requests' default connection pool holds 10 per host
+FETCH_WORKERS = int(os.getenv("API_FETCH_WORKERS", "8"))
+
+# (connect, read) timeouts in seconds; the longest matching path prefix wins
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "10"))
+ENDPOINT_TIMEOUTS = {
+    '/health': (CONNECT_TIMEOUT, 3),
+    '/api/v1/analytics/': (CONNECT_TIMEOUT, 20),
+    '/api/v1/sales/bulk': (CONNECT_TIMEOUT, 60),
+    '/api/v1/products/import': (CONNECT_TIMEOUT, 120),
+    '/api/v1/expenses/import': (CONNECT_TIMEOUT, 120),
+}
+
+# GETs are retried on connection errors, timeouts and these statuses; writes never are
+GET_RETRIES = int(os.getenv("API_GET_RETRIES", "2"))
+RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.25"))
+RETRY_BACKOFF_MAX = 2.0
+RETRY_STATUSES = {502, 503, 504}
+
+# Consecutive failures that open the circuit, and how long it stays open before a trial request
+BREAKER_THRESHOLD = int(os.getenv("API_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("API_BREAKER_RESET_TIMEOUT", "30"))
+# Seconds between /health probes while the circuit is open
+HEALTH_PROBE_INTERVAL = float(os.getenv("API_HEALTH_PROBE_INTERVAL", "10"))
+
+
+class CircuitBreaker:
+    """Fails calls fast after repeated backend failures instead of waiting on every timeout.
+
+    ``closed`` lets everything through. ``BREAKER_THRESHOLD`` consecutive
+    failures open it; once ``reset_timeout`` has passed a single trial request
+    is allowed (``half_open``), and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Backend responding again, closing circuit")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or (self._opened_at is None and self._failures >= self.threshold):
+                logger.warning(f"Opening circuit after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def trip(self):
+        with self._lock:
+            self._failures = max(self._failures, self.threshold)
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class ValidatorCache:
+    """Thread-safe LRU of GET responses keyed by full URL, revalidated with conditional requests.
+
+    Bodies are kept as raw bytes and parsed again on every hit, so callers never
+    share (and mutate) a cached object.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Dict[str, str], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry[0]) if entry else {}
+
+    def body(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def store(self, key: str, response: requests.Response):
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        with self._lock:
+            self.misses += 1
+            if not validators:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (validators, response.content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "not_modified": self.hits,
+                "full_responses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
 
 class APIClient:
     """SmartTrack API Client"""
@@ -18,16 +170,135 @@ class APIClient:
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            # Every encoding urllib3 can decode here (gzip/deflate, plus br/zstd when installed)
+            'Accept-Encoding': DEFAULT_ACCEPT_ENCODING
         })
-        self.timeout = 30
+        self.default_timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self.timeouts = dict(ENDPOINT_TIMEOUTS)
+        self.breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        self._probe_thread: Optional[threading.Thread] = None
+        self.validators = ValidatorCache(VALIDATOR_CACHE_SIZE) if VALIDATOR_CACHE_SIZE > 0 else None
+        self._executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="api-fetch")
+
+    def fetch_concurrently(self, calls: Dict[str, Callable[[], Any]], label: str = "fetch") -> Dict[str, Any]:
+        """Run independent zero-argument calls in parallel and return ``{name: result}``.
+
+        A call that raises is logged and yields None, like a failed request. Total
+        and per-call wall time are logged under ``label``.
+        """
+        def timed(name, call):
+            start = time.perf_counter()
+            try:
+                return call(), time.perf_counter() - start
+            except Exception as e:
+                logger.warning(f"Concurrent call {label}.{name} failed: {str(e)}")
+                return None, time.perf_counter() - start
+
+        start = time.perf_counter()
+        futures = {name: self._executor.submit(timed, name, call) for name, call in calls.items()}
+        results, timings = {}, []
+        for name, future in futures.items():
+            results[name], elapsed = future.result()
+            timings.append(f"{name}={elapsed * 1000:.0f}ms")
+        logger.info(f"{label}: {len(calls)} calls in {(time.perf_counter() - start) * 1000:.0f}ms "
+                    f"({', '.join(timings)})")
+        return results
+
+    @property
+    def available(self) -> bool:
+        """False while the circuit is open, i.e. the backend is known to be down."""
+        return self.breaker.state != "open"
+
+    def probe(self) -> bool:
+        """Check /health directly, bypassing the breaker, and close or trip the circuit accordingly."""
+        try:
+            response = self.session.get(f"{self.base_url}/health", timeout=self._timeout_for('/health'))
+            response.raise_for_status()
+        except Exception as e:
+            # Only the first failure is worth a warning; the probe repeats while the backend is down
+            log = logger.warning if self.breaker.state == "closed" else logger.debug
+            log(f"Backend health probe failed: {str(e)}")
+            self.breaker.trip()
+            return False
+        self.breaker.record_success()
+        return True
+
+    def start_health_probe(self, interval: float = HEALTH_PROBE_INTERVAL):
+        """Probe /health in a daemon thread while the circuit is open, re-enabling the client on recovery."""
+        if self._probe_thread is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                if self.breaker.state != "closed":
+                    self.probe()
+
+        self._probe_thread = threading.Thread(target=run, name="api-health-probe", daemon=True)
+        self._probe_thread.start()
+
+    def _timeout_for(self, endpoint: str) -> Tuple[float, float]:
+        matches = [prefix for prefix in self.timeouts if endpoint.startswith(prefix)]
+        return self.timeouts[max(matches, key=len)] if matches else self.default_timeout
+
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send one request with the endpoint's timeouts, retrying transient GET failures.
+
+        Retries use full-jitter exponential backoff so clients recovering at the
+        same moment do not hit the backend in lockstep. The circuit breaker sees
+        one outcome per call, after any retries: connection errors, timeouts and
+        5xx answers are failures, anything else (including 4xx) is healthy.
+        """
+        url = f"{self.base_url}{endpoint}"
+        attempts = 1 + (GET_RETRIES if method == 'GET' else 0)
+        for attempt in range(attempts):
+            last_attempt = attempt + 1 == attempts
+            try:
+                response = self.session.request(method, url, timeout=self._timeout_for(endpoint), **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                if last_attempt:
+                    self.breaker.record_failure()
+                    raise
+            else:
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                if last_attempt or response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_failure()
+                    return response
+            delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** attempt))
+            logger.info(f"Retrying {method} {endpoint} in {delay:.2f}s (attempt {attempt + 2}/{attempts})")
+            time.sleep(delay)
 
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict[Any, Any]]:
-        """Make HTTP request with error handling"""
+        """Make HTTP request with error handling
+
+        GETs are sent as conditional requests when a previous response carried
+        validators; a 304 answer returns the cached body instead. While the
+        circuit is open the request is not sent and None is returned at once.
+        """
+        if not self.breaker.allow_request():
+            logger.warning(f"Circuit open, skipping: {method} {endpoint}")
+            return None
         try:
-            url = f"{self.base_url}{endpoint}"
-            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            cache_key = None
+            if method == 'GET' and self.validators is not None:
+                url = f"{self.base_url}{endpoint}"
+                cache_key = requests.Request(method, url, params=kwargs.get('params')).prepare().url
+                conditional = {**self.validators.conditional_headers(cache_key), **kwargs.get('headers', {})}
+                response = self._send(method, endpoint, **{**kwargs, 'headers': conditional})
+                if response.status_code == 304:
+                    body = self.validators.body(cache_key)
+                    if body is not None:
+                        return json.loads(body)
+                    # Evicted while the request was in flight; fetch the full response
+                    response = self._send(method, endpoint, **kwargs)
+            else:
+                response = self._send(method, endpoint, **kwargs)
             response.raise_for_status()
+            if cache_key:
+                self.validators.store(cache_key, response)
             return response.json()
         except requests.exceptions.Timeout:
             logger.error(f"Request timeout: {method} {endpoint}")
@@ -42,6 +313,12 @@ class APIClient:
             logger.error(f"Unexpected error: {method} {endpoint} - {str(e)}")
             return None
 
+    def _upload(self, endpoint: str, file_obj, filename: str) -> Optional[Dict[Any, Any]]:
+        """Stream a CSV/NDJSON file to an import endpoint as multipart form data"""
+        # Drop the session-wide JSON content type so requests sets the multipart boundary
+        return self._make_request('POST', endpoint, files={'file': (filename, file_obj)},
+                                  headers={'Content-Type': None})
+
     # Health check
     def health_check(self) -> Optional[Dict[Any, Any]]:
         return self._make_request('GET', '/health')
@@ -51,13 +328,17 @@ class APIClient:
         return self._make_request('GET', '/api/v1/analytics/dashboard/summary')
 
     # Products
-    def get_products(self, skip: int = 0, limit: int = 100, active_only: bool = True) -> Optional[List[Dict]]:
-        params = {'skip': skip, 'limit': limit, 'active_only': active_only}
+    def get_products(self, skip: int = 0, limit: int = 100, active_only: bool = True,
+                     view: Optional[str] = None, fields: Optional[List[str]] = None) -> Optional[List[Dict]]:
+        params = {'skip': skip, 'limit': limit, 'active_only': active_only, **self._fieldset(view, fields)}
         return self._make_request('GET', '/api/v1/products/', params=params)
 
     def create_product(self, product_data: Dict[Any, Any]) -> Optional[Dict[Any, Any]]:
         return self._make_request('POST', '/api/v1/products/', json=product_data)
 
+    def import_products(self, file_obj, filename: str) -> Optional[Dict[Any, Any]]:
+        return self._upload('/api/v1/products/import', file_obj, filename)
+
     def get_categories(self, category_type: Optional[str] = None) -> Optional[List[Dict]]:
         params = {}
         if category_type:
@@ -67,10 +348,21 @@ class APIClient:
     def create_category(self, category_data: Dict[Any, Any]) -> Optional[Dict[Any, Any]]:
         return self._make_request('POST', '/api/v1/products/categories/', json=category_data)
 
+    @staticmethod
+    def _fieldset(view: Optional[str], fields: Optional[List[str]]) -> Dict[str, str]:
+        """Query params asking a list endpoint for a sparse representation."""
+        params = {}
+        if view:
+            params['view'] = view
+        if fields:
+            params['fields'] = ','.join(fields)
+        return params
+
     # Sales
     def get_sales(self, skip: int = 0, limit: int = 100,
-                  start_date: Optional[date] = None, end_date: Optional[date] = None) -> Optional[List[Dict]]:
-        params = {'skip': skip, 'limit': limit}
+                  start_date: Optional[date] = None, end_date: Optional[date] = None,
+                  view: Optional[str] = None, fields: Optional[List[str]] = None) -> Optional[List[Dict]]:
+        params = {'skip': skip, 'limit': limit, **self._fieldset(view, fields)}
         if start_date:
             params['start_date'] = str(start_date)
         if end_date:
@@ -80,10 +372,14 @@ class APIClient:
     def create_sale(self, sale_data: Dict[Any, Any]) -> Optional[Dict[Any, Any]]:
         return self._make_request('POST', '/api/v1/sales/', json=sale_data)
 
+    def create_sales_bulk(self, sales: List[Dict[Any, Any]]) -> Optional[Dict[Any, Any]]:
+        return self._make_request('POST', '/api/v1/sales/bulk', json={'sales': sales})
+
     # Expenses
     def get_expenses(self, skip: int = 0, limit: int = 100,
-                     start_date: Optional[date] = None, end_date: Optional[date] = None) -> Optional[List[Dict]]:
-        params = {'skip': skip, 'limit': limit}
+                     start_date: Optional[date] = None, end_date: Optional[date] = None,
+                     view: Optional[str] = None, fields: Optional[List[str]] = None) -> Optional[List[Dict]]:
+        params = {'skip': skip, 'limit': limit, **self._fieldset(view, fields)}
         if start_date:
             params['start_date'] = str(start_date)
         if end_date:
@@ -93,6 +389,28 @@ class APIClient:
     def create_expense(self, expense_data: Dict[Any, Any]) -> Optional[Dict[Any, Any]]:
         return self._make_request('POST', '/api/v1/expenses/', json=expense_data)
 
+    def import_expenses(self, file_obj, filename: str) -> Optional[Dict[Any, Any]]:
+        return self._upload('/api/v1/expenses/import', file_obj, filename)
+
     # Analytics
-    def get_product_profit_analysis(self) -> Optional[Dict[Any, Any]]:
-        return self._make_request('GET', '/api/v1/analytics/products/profit')
\ No newline at end of file
+    def get_product_profit_analysis(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                                    category_id: Optional[int] = None, sort_by: str = 'profit',
+                                    order: str = 'desc', skip: int = 0,
+                                    limit: int = 100) -> Optional[Dict[Any, Any]]:
+        params = {'sort_by': sort_by, 'order': order, 'skip': skip, 'limit': limit}
+        if start_date:
+            params['start'] = str(start_date)
+        if end_date:
+            params['end'] = str(end_date)
+        if category_id is not None:
+            params['category_id'] = category_id
+        return self._make_request('GET', '/api/v1/analytics/products/profit', params=params)
+
+    def get_trends(self, granularity: str = 'month',
+                   start_date: Optional[date] = None, end_date: Optional[date] = None) -> Optional[Dict[Any, Any]]:
+        params = {'granularity': granularity}
+        if start_date:
+            params['start'] = str(start_date)
+        if end_date:
+            params['end'] = str(end_date)
+        return self._make_request('GET', '/api/v1/analytics/trends', params=params)
\ No newline at end of file